@@ -1,43 +1,84 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 import random
-import heapq
 import copy
-from collections import deque
 import json
 import time
 import threading
 import os 
-
-# this project uses the 'playsound' library for sound effects.
-# to install it, run this command in your terminal:
-# pip install playsound==1.2.2
-try:
-    from playsound import playsound
-except ImportError:
-    print("playsound library not found, so sound effects will be disabled.")
-    print("to enable sound, run: pip install playsound==1.2.2")
-    playsound = None
-
-# game constants
-GOAL_STATE = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-BOARD_SIZE = 3
-EMPTY_TILE = 0
+import sys
+
+# game constants and the search engine live in solver.py
+from solver import GOAL_STATE, BOARD_SIZE, EMPTY_TILE, DEFAULT_WEIGHT, SearchBudget, get_layout, solve
+from solution_cache import CACHE_PATH, SolutionCache
+import distance_table
+import generator
+
+# tk and the sound stack are only imported once a window is actually opened, so
+# --batch (and every worker process it spawns, which re-imports this file) never
+# pays for them
+tk = ttk = messagebox = filedialog = SoundPlayer = None
+
+
+def _load_gui():
+    global tk, ttk, messagebox, filedialog, SoundPlayer
+    if tk is not None: return
+    import tkinter
+    from tkinter import ttk as tk_ttk, messagebox as tk_messagebox, filedialog as tk_filedialog
+    from sound import SoundPlayer as sound_player
+    tk, ttk, messagebox, filedialog, SoundPlayer = tkinter, tk_ttk, tk_messagebox, tk_filedialog, sound_player
+
+# algorithm menu label -> solver algorithm name
+ALGORITHM_CHOICES = {
+    "Distance Table": "table",
+    "A* (Manhattan)": "astar-manhattan",
+    "A* (Misplaced)": "astar-misplaced",
+    "Weighted A*": "weighted-astar",
+    "ARA* (anytime)": "arastar",
+    "IDA* (Linear Conflict)": "idastar",
+    "BFS": "bfs",
+    "Bidirectional BFS": "bibfs",
+    "Bidirectional A*": "bidirectional-astar",
+}
+
+# difficulty menu label -> range of shortest solution lengths, None for any solvable board
+DIFFICULTY_CHOICES = {
+    "Easy": (4, 10),
+    "Medium": (12, 18),
+    "Hard": (20, 25),
+    "Expert": (26, 31),
+    "Random": None,
+}
+
+# playback speed menu label -> multiplier on the slide speed
+PLAYBACK_SPEEDS = {"0.5x": 0.5, "1x": 1.0, "2x": 2.0, "4x": 4.0, "8x": 8.0}
 
 # ui layout constants
 TILE_SIZE = 120
 TILE_PADDING = 10
 CORNER_RADIUS = 24
 ELEVATION_OFFSET = 4
+SEARCH_POLL_MS = 100 # how often the ui checks on a background search
+SLIDE_MS = 120 # how long one tile slide takes at 1x
+FRAME_MS = 16 # how often a slide is redrawn, frames the event loop misses are dropped
+HINT_DEADLINE = 1.0 # seconds an anytime hint search gets to improve its answer
 
 class PuzzleGUI:
     def __init__(self, root):
+        _load_gui()
         self.root = root
         self.root.title("8-Puzzle AI Pro")
         self.root.resizable(False, False)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.is_animating = False
-        self.sound_enabled = playsound is not None
+        self.skip_playback = False
+        # sound effects are loaded once here and played by a single background worker
+        self.sounds = SoundPlayer()
+        self.search_budget = None # budget of the search running in the background, if any
+
+        # every state on a solution we've seen gets an instant hint; a cache saved
+        # by an earlier session is read the first time it's needed. the distance
+        # table is mmapped on first use too (and built then if it's missing)
+        self.layout = get_layout(BOARD_SIZE)
+        self.solution_cache = SolutionCache(self.layout, path=CACHE_PATH)
 
         self._initialize_colors_and_styles()
         self.board = copy.deepcopy(GOAL_STATE)
@@ -88,7 +129,18 @@ class PuzzleGUI:
         self.canvas = tk.Canvas(parent, width=canvas_size, height=canvas_size, bg=self.colors["surface"], highlightthickness=0)
         self.canvas.pack(pady=15)
         self.canvas.bind("<Button-1>", self._canvas_click_handler)
-        self.tile_items = {} # stores canvas item ids for each tile's parts
+        # every tile is drawn once, at the goal, and only ever moved or recoloured after that
+        self.tile_items = {} # tile -> (rect, shadow, text) canvas item ids
+        self.hint_tile = None
+        for i in range(BOARD_SIZE):
+            for j in range(BOARD_SIZE):
+                val = GOAL_STATE[i][j]
+                if val == EMPTY_TILE: continue
+                x1, y1, x2, y2 = self._get_coords(i, j)
+                shadow = self._create_rounded_rectangle(x1, y1 + ELEVATION_OFFSET, x2, y2 + ELEVATION_OFFSET, CORNER_RADIUS, fill=self.colors["shadow"], width=0)
+                rect = self._create_rounded_rectangle(x1, y1, x2, y2, CORNER_RADIUS, fill=self.tile_colors[val], width=0)
+                text = self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text=str(val), font=("Roboto Medium", 48, "bold"), fill=self.colors["tile_text"])
+                self.tile_items[val] = (rect, shadow, text)
 
     def _create_control_panel(self, parent):
         # creates the bottom panel with all the user controls
@@ -97,48 +149,87 @@ class PuzzleGUI:
         
         # row 0: algorithm selection
         ttk.Label(control_frame, text="Algorithm:", font=("Roboto", 13)).grid(row=0, column=0, columnspan=2, padx=5, pady=5, sticky="w")
-        self.algo_var = tk.StringVar(value="A* (Manhattan)")
-        algo_menu = ttk.OptionMenu(control_frame, self.algo_var, "A* (Manhattan)", "A* (Manhattan)", "A* (Misplaced)", "BFS")
+        self.algo_var = tk.StringVar(value="Distance Table")
+        algo_menu = ttk.OptionMenu(control_frame, self.algo_var, "Distance Table", *ALGORITHM_CHOICES)
         algo_menu.grid(row=0, column=2, columnspan=2, padx=5, pady=5, sticky="ew")
 
-        # row 1: main action buttons
+        # row 1: how hard new puzzles are
+        ttk.Label(control_frame, text="Difficulty:", font=("Roboto", 13)).grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        self.difficulty_var = tk.StringVar(value="Medium")
+        difficulty_menu = ttk.OptionMenu(control_frame, self.difficulty_var, "Medium", *DIFFICULTY_CHOICES)
+        difficulty_menu.grid(row=1, column=2, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        # row 2: main action buttons
         self.solve_button = ttk.Button(control_frame, text="Solve", command=self.auto_solve, style="M3.TButton")
-        self.solve_button.grid(row=1, column=0, columnspan=2, padx=5, pady=10, sticky="ew")
+        self.solve_button.grid(row=2, column=0, columnspan=2, padx=5, pady=10, sticky="ew")
         self.new_game_button = ttk.Button(control_frame, text="New Puzzle", command=self.new_game, style="M3.TButton")
-        self.new_game_button.grid(row=1, column=2, columnspan=2, padx=5, pady=10, sticky="ew")
+        self.new_game_button.grid(row=2, column=2, columnspan=2, padx=5, pady=10, sticky="ew")
         
-        # row 2: hint and save/load
+        # row 3: hint and save/load
         self.hint_button = ttk.Button(control_frame, text="Hint", command=self.get_hint, style="M3.TButton")
-        self.hint_button.grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+        self.hint_button.grid(row=3, column=0, padx=5, pady=5, sticky="ew")
         self.save_button = ttk.Button(control_frame, text="Save", command=self.save_game, style="M3.TButton")
-        self.save_button.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        self.save_button.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
         self.load_button = ttk.Button(control_frame, text="Load", command=self.load_game, style="M3.TButton")
-        self.load_button.grid(row=2, column=2, columnspan=2, padx=5, pady=5, sticky="ew")
+        self.load_button.grid(row=3, column=2, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        # row 4: search budgets, leave a box empty for no limit
+        budget_frame = ttk.Frame(control_frame, style="App.TFrame")
+        budget_frame.grid(row=4, column=0, columnspan=4, padx=5, pady=5, sticky="ew")
+        self.max_nodes_var = tk.StringVar(value="")
+        self.max_seconds_var = tk.StringVar(value="60")
+        self.max_memory_var = tk.StringVar(value="1024")
+        for col, (text, var) in enumerate([("Max nodes", self.max_nodes_var), ("Max secs", self.max_seconds_var), ("Max MB", self.max_memory_var)]):
+            ttk.Label(budget_frame, text=text, font=("Roboto", 11)).grid(row=0, column=2 * col, padx=(0, 4), sticky="w")
+            ttk.Entry(budget_frame, textvariable=var, width=8).grid(row=0, column=2 * col + 1, padx=(0, 10), sticky="w")
+        # heuristic weight for weighted a*, bigger is faster but further from the shortest path
+        self.weight_var = tk.StringVar(value=str(DEFAULT_WEIGHT))
+        ttk.Label(budget_frame, text="Weight", font=("Roboto", 11)).grid(row=1, column=0, padx=(0, 4), pady=(6, 0), sticky="w")
+        ttk.Entry(budget_frame, textvariable=self.weight_var, width=8).grid(row=1, column=1, padx=(0, 10), pady=(6, 0), sticky="w")
+        self.persist_cache_var = tk.BooleanVar(value=os.path.exists(CACHE_PATH))
+        ttk.Checkbutton(budget_frame, text="Remember solutions", variable=self.persist_cache_var).grid(row=1, column=2, columnspan=4, pady=(6, 0), sticky="w")
+
+        # row 5: live search progress and cancel
+        self.progress_label = ttk.Label(control_frame, text="", font=("Roboto", 11))
+        self.progress_label.grid(row=5, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.cancel_button = ttk.Button(control_frame, text="Cancel", command=self.cancel_search, style="M3.TButton", state=tk.DISABLED)
+        self.cancel_button.grid(row=5, column=3, padx=5, pady=5, sticky="ew")
+
+        # row 6: solution playback speed and skipping to the end
+        ttk.Label(control_frame, text="Playback:", font=("Roboto", 13)).grid(row=6, column=0, padx=5, pady=5, sticky="w")
+        self.speed_var = tk.StringVar(value="1x")
+        speed_menu = ttk.OptionMenu(control_frame, self.speed_var, "1x", *PLAYBACK_SPEEDS)
+        speed_menu.grid(row=6, column=1, padx=5, pady=5, sticky="ew")
+        self.skip_button = ttk.Button(control_frame, text="Skip to End", command=self.skip_to_end, style="M3.TButton", state=tk.DISABLED)
+        self.skip_button.grid(row=6, column=2, columnspan=2, padx=5, pady=5, sticky="ew")
 
         for i in range(4): control_frame.columnconfigure(i, weight=1)
 
     def redraw_board(self, hint_tile_val=None):
-        # redraws the entire board, optionally highlighting a tile for the hint
-        self.canvas.delete("all")
-        self.tile_items.clear()
+        # brings the canvas in line with self.board: tiles that are out of place are
+        # moved (from wherever they are, even halfway through a slide) and only the
+        # shadows whose hint state changed are recoloured
         for i in range(BOARD_SIZE):
             for j in range(BOARD_SIZE):
                 val = self.board[i][j]
-                if val != EMPTY_TILE:
-                    x1, y1, x2, y2 = self._get_coords(i, j)
-                    
-                    shadow_color = self.colors["hint"] if val == hint_tile_val else self.colors["shadow"]
-                    shadow = self._create_rounded_rectangle(x1, y1 + ELEVATION_OFFSET, x2, y2 + ELEVATION_OFFSET, CORNER_RADIUS, fill=shadow_color, width=0)
-                    rect = self._create_rounded_rectangle(x1, y1, x2, y2, CORNER_RADIUS, fill=self.tile_colors[val], width=0)
-                    text = self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text=str(val), font=("Roboto Medium", 48, "bold"), fill=self.colors["tile_text"])
-                    
-                    self.tile_items[val] = (rect, shadow, text)
+                if val == EMPTY_TILE: continue
+                x1, y1, x2, y2 = self._get_coords(i, j)
+                item_ids = self.tile_items[val]
+                cx, cy = self.canvas.coords(item_ids[2])[:2]
+                dx, dy = (x1 + x2) / 2 - cx, (y1 + y2) / 2 - cy
+                if dx or dy:
+                    for item_id in item_ids:
+                        self.canvas.move(item_id, dx, dy)
+        if hint_tile_val != self.hint_tile:
+            if self.hint_tile is not None:
+                self.canvas.itemconfig(self.tile_items[self.hint_tile][1], fill=self.colors["shadow"])
+            if hint_tile_val is not None:
+                self.canvas.itemconfig(self.tile_items[hint_tile_val][1], fill=self.colors["hint"])
+            self.hint_tile = hint_tile_val
 
     def _play_sound(self, sound_file):
-        # plays a sound in a separate thread to avoid freezing the ui
-        # checks if the file exists first to prevent crashing
-        if self.sound_enabled and os.path.exists(sound_file):
-            threading.Thread(target=lambda: playsound(sound_file), daemon=True).start()
+        # hands the sound to the audio worker, never waits for it; missing files are skipped
+        self.sounds.play(sound_file)
 
     def move_tile(self, r, c, is_auto_move=False):
         # handles the logic for moving a tile when clicked
@@ -163,7 +254,6 @@ class PuzzleGUI:
                 if not is_auto_move:
                     self.moves += 1
                     self.moves_label.config(text=f"Moves: {self.moves}")
-                    self.redraw_board() # redraw to fix layering issues after move
                     if self.check_win():
                         self.stop_timer()
                         self._play_sound("solve.wav")
@@ -172,7 +262,8 @@ class PuzzleGUI:
                     if hasattr(self, '_animation_callback'):
                         self._animation_callback()
             
-            self._animate_tile_slide(item_ids, (r,c), (blank_r, blank_c), on_animation_finish)
+            duration = SLIDE_MS / self._playback_speed() if is_auto_move else SLIDE_MS
+            self._animate_tile_slide(item_ids, (r,c), (blank_r, blank_c), on_animation_finish, duration)
 
     def update_timer(self):
         # updates the timer label every second
@@ -183,49 +274,158 @@ class PuzzleGUI:
             self.root.after(1000, self.update_timer)
 
     def auto_solve(self):
-        # starts the automatic solving process
-        self.solve_button['state'] = tk.DISABLED
-        self.new_game_button['state'] = tk.DISABLED
+        # starts the automatic solving process, the search itself runs in the background
+        if self.is_animating: return
+        self.is_animating = True
+        self._set_busy(True)
         self.reset_stats()
         self.start_timer()
 
-        choice = self.algo_var.get()
-        start_time = time.time()
-        
-        if "Manhattan" in choice:
-            path, stats = self._solve_astar(self.manhattan_distance)
-        elif "Misplaced" in choice:
-            path, stats = self._solve_astar(self.misplaced_tiles)
-        else:
-            path, stats = self._solve_bfs()
-
-        search_time = time.time() - start_time
-        
+        algorithm = ALGORITHM_CHOICES[self.algo_var.get()]
+        options = {}
+        if algorithm == "weighted-astar":
+            try:
+                options["weight"] = max(1.0, float(self.weight_var.get()))
+            except ValueError:
+                options["weight"] = DEFAULT_WEIGHT
+        self._run_search(algorithm, self._on_solve_finished, **options)
+
+    def _on_solve_finished(self, path, stats):
+        # called on the tk thread once the background search is over
         if path:
             self.solution_path = path
             self.solution_stats = stats
-            self.solution_stats["search_time"] = search_time
+            self.skip_playback = False
+            self.skip_button['state'] = tk.NORMAL
             self.animate_solution_step(0)
+            return
+
+        self.stop_timer()
+        self.is_animating = False
+        if "aborted" in stats:
+            message = (f"The search was stopped ({stats['aborted']}).\n\n"
+                       f"Frontier Size: {stats.get('frontier', 0)}\n"
+                       + self._format_search_stats(stats))
+            messagebox.showinfo("Search Stopped", message)
         else:
-            self.stop_timer()
             messagebox.showerror("Error", "Could not find a solution!")
-            self.solve_button['state'] = tk.NORMAL
-            self.new_game_button['state'] = tk.NORMAL
+        self._set_busy(False)
+
+    def _set_busy(self, busy):
+        # greys out everything that would change the board under a running search or playback
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.solve_button, self.new_game_button, self.hint_button, self.load_button):
+            button['state'] = state
+
+    def _format_search_stats(self, stats):
+        # the search instrumentation, one line per counter, for the result dialogs
+        search_time = stats['search_time']
+        lines = [f"States Explored: {stats['nodes_expanded']}",
+                 f"States Generated: {stats.get('nodes_generated', 0)}",
+                 f"Duplicates Skipped: {stats.get('duplicates', 0)}",
+                 f"Peak Open / Closed: {stats.get('peak_open', 0)} / {stats.get('peak_closed', 0)}"]
+        if stats.get("suboptimality", 1) > 1:
+            lines.append(f"At Most {stats['suboptimality']:.2f}x the Shortest Solution")
+        if "heuristic_time" in stats:
+            lines.append(f"Heuristic Time: {stats['heuristic_time']:.4f} seconds")
+        if search_time > 0:
+            lines.append(f"Speed: {stats['nodes_expanded'] / search_time:,.0f} states/sec")
+        lines.append(f"Search Time: {search_time:.4f} seconds")
+        return "\n".join(lines)
+
+    def _read_budget(self):
+        # builds a search budget from the budget boxes, empty or invalid boxes mean no limit
+        def value(var, kind):
+            try:
+                return kind(var.get().strip()) or None
+            except ValueError:
+                return None
+        return SearchBudget(max_nodes=value(self.max_nodes_var, int),
+                            max_seconds=value(self.max_seconds_var, float),
+                            max_memory_mb=value(self.max_memory_var, float),
+                            time_heuristic=True)
+
+    def _run_search(self, algorithm, on_done, **options):
+        # solves a copy of the board on a worker thread so the window never freezes.
+        # the worker only stores its result; the tk loop polls for it (and for
+        # progress) every SEARCH_POLL_MS and hands it to on_done on the tk thread.
+        # anytime searches also report each better path as they find it
+        self._set_busy(True)
+        budget = self.search_budget = self._read_budget()
+        board = self.search_board = copy.deepcopy(self.board)
+        self.search_result = None
+        self.search_best = None
+        if algorithm == "arastar":
+            options["on_improve"] = self._on_improve
+
+        def work():
+            start_time = time.time()
+            try:
+                path, stats = solve(board, algorithm, budget, **options)
+            except Exception as e:
+                path, stats = None, {"nodes_expanded": budget.snapshot["nodes_expanded"], "aborted": f"error: {e}"}
+            stats["search_time"] = time.time() - start_time
+            self.search_result = (path, stats)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.cancel_button['state'] = tk.NORMAL
+        self.root.after(SEARCH_POLL_MS, lambda: self._poll_search(on_done))
+
+    def _poll_search(self, on_done):
+        # shows live progress until the worker has finished, then reports back
+        if self.search_result is None:
+            snapshot = self.search_budget.snapshot
+            text = f"Nodes: {snapshot['nodes_expanded']:,}   Frontier: {snapshot['frontier']:,}"
+            if self.search_best:
+                text += f"   Best: {self.search_best[0]} moves (within {self.search_best[1]:.2f}x)"
+            self.progress_label.config(text=text)
+            self.root.after(SEARCH_POLL_MS, lambda: self._poll_search(on_done))
+            return
+
+        path, stats = self.search_result
+        self.search_budget = None
+        if path and self.board != self.search_board:
+            # the buttons are greyed out, but a path for some other board must never be played
+            path, stats = None, dict(stats, aborted="the board changed during the search")
+        # only paths known to be shortest go in the cache, every hint relies on that
+        if path and stats.get("suboptimality", 1) <= 1:
+            self.solution_cache.store(self.layout.pack(self.search_board), [self.layout.pack(b) for b in path])
+        self.cancel_button['state'] = tk.DISABLED
+        self.progress_label.config(text=f"Nodes: {stats['nodes_expanded']:,}   Time: {stats['search_time']:.2f}s")
+        on_done(path, stats)
+
+    def _on_improve(self, path, length, bound):
+        # called on the search thread by anytime searches, picked up by _poll_search
+        self.search_best = (length, bound)
+
+    def cancel_search(self):
+        # asks the background search to stop, it reports back with partial stats
+        if self.search_budget: self.search_budget.cancel()
     
+    def _playback_speed(self): return PLAYBACK_SPEEDS.get(self.speed_var.get(), 1.0)
+
+    def skip_to_end(self):
+        # applies the rest of the ai's solution in one go instead of animating it
+        self.skip_playback = True
+
     def animate_solution_step(self, index):
         # animates one step of the ai's solution path
+        if self.skip_playback and index < len(self.solution_path):
+            self.board = copy.deepcopy(self.solution_path[-1])
+            self.redraw_board()
+            index = len(self.solution_path)
         self.moves_label.config(text=f"Moves: {index}")
         if index >= len(self.solution_path):
+            self.skip_button['state'] = tk.DISABLED
+            self.skip_playback = False
             self.stop_timer()
             self._play_sound("solve.wav")
             stats = self.solution_stats
             message = (f"AI solved the puzzle!\n\n"
                        f"Path Length: {len(self.solution_path)} moves\n"
-                       f"States Explored: {stats['nodes_expanded']}\n"
-                       f"Search Time: {stats['search_time']:.4f} seconds")
+                       + self._format_search_stats(stats))
             messagebox.showinfo("Solved!", message)
-            self.solve_button['state'] = tk.NORMAL
-            self.new_game_button['state'] = tk.NORMAL
+            self._set_busy(False)
             self.is_animating = False
             return
         
@@ -237,38 +437,31 @@ class PuzzleGUI:
         self._animation_callback = lambda: self.animate_solution_step(index + 1)
         self.move_tile(tile_to_move_r, tile_to_move_c, is_auto_move=True)
     
-    def _solve_astar(self, heuristic):
-        # a* search algorithm, now returns path and performance stats
-        nodes_expanded = 0
-        start_node = self.board
-        open_set = []
-        heapq.heappush(open_set, (heuristic(start_node), 0, start_node, []))
-        visited = set()
-
-        while open_set:
-            _, cost_so_far, current_board, path = heapq.heappop(open_set)
-            nodes_expanded += 1
-            
-            if self.board_to_tuple(current_board) in visited: continue
-            visited.add(self.board_to_tuple(current_board))
-
-            if current_board == GOAL_STATE:
-                return path, {"nodes_expanded": nodes_expanded}
-            
-            for neighbor in self._get_neighbors(current_board):
-                 if self.board_to_tuple(neighbor) not in visited:
-                    new_cost = cost_so_far + 1
-                    f_score = new_cost + heuristic(neighbor)
-                    heapq.heappush(open_set, (f_score, new_cost, neighbor, path + [neighbor]))
-        return None, {"nodes_expanded": nodes_expanded}
-
     def get_hint(self):
         # shows the user the next best move
         if self.is_animating: return
         self.is_animating = True
-        
-        path, _ = self._solve_astar(self.manhattan_distance)
-        
+
+        # following an earlier hint (or a solution we've already seen) is a single lookup
+        next_state = self.solution_cache.next_state(self.layout.pack(self.board))
+        if next_state is not None:
+            self._show_hint([self.layout.unpack(next_state)], {"nodes_expanded": 0})
+            return
+        if self.layout.size == distance_table.TABLE_SIZE:
+            self._run_search("table", self._show_hint)
+        else:
+            # no exact table for this size: take the best anytime answer after a moment
+            self._run_search("arastar", self._show_hint, deadline=HINT_DEADLINE)
+
+    def _show_hint(self, path, stats):
+        # flashes the tile to move next once the hint search is back
+        self._set_busy(False)
+        if not path and "aborted" in stats:
+            message = (f"The hint search was stopped ({stats['aborted']}).\n\n"
+                       + self._format_search_stats(stats))
+            messagebox.showinfo("Hint", message)
+            self.is_animating = False
+            return
         if not path:
             messagebox.showinfo("Hint", "The puzzle is already solved or unsolvable.")
             self.is_animating = False
@@ -322,7 +515,13 @@ class PuzzleGUI:
 
     def on_closing(self):
         # handles the window closing event gracefully
+        self.cancel_search()
         self.stop_timer()
+        self.sounds.close()
+        if self.persist_cache_var.get():
+            self.solution_cache.save()
+        elif os.path.exists(CACHE_PATH):
+            os.remove(CACHE_PATH)
         self.root.destroy()
 
     # helper methods below are mostly unchanged
@@ -343,7 +542,7 @@ class PuzzleGUI:
     
     def new_game(self):
         # sets up a new puzzle
-        self.generate_puzzle(difficulty_moves=50)
+        self.generate_puzzle(self.difficulty_var.get())
         self.redraw_board()
         self.reset_stats()
         self.stop_timer()
@@ -357,26 +556,33 @@ class PuzzleGUI:
         if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
             self.move_tile(row, col)
     
-    def _animate_tile_slide(self, item_ids, from_pos, to_pos, on_finish_callback):
-        # smoothly animates a tile sliding from one spot to another
-        rect_id, shadow_id, text_id = item_ids
+    def _animate_tile_slide(self, item_ids, from_pos, to_pos, on_finish_callback, duration=SLIDE_MS):
+        # slides a tile over `duration` ms. each frame puts it where it should be by
+        # now, so if the event loop falls behind the missed frames are simply dropped
+        # and the slide still ends on time. skipping playback ends it at once
         from_r, from_c = from_pos
         to_r, to_c = to_pos
         start_x, start_y, _, _ = self._get_coords(from_r, from_c)
         end_x, end_y, _, _ = self._get_coords(to_r, to_c)
         dx, dy = end_x - start_x, end_y - start_y
-        num_steps = 15
-        step_x, step_y = dx / num_steps, dy / num_steps
-
-        def _step(current_step):
-            if current_step <= num_steps:
-                for item_id in item_ids:
-                    self.canvas.move(item_id, step_x, step_y)
-                self.root.after(8, lambda: _step(current_step + 1))
+        rect_id, shadow_id, text_id = item_ids
+        for item_id in (shadow_id, rect_id, text_id): # the sliding tile passes over its neighbours
+            self.canvas.tag_raise(item_id)
+        started = time.perf_counter()
+        done = [0.0] # fraction of the slide already drawn
+
+        def _step():
+            progress = 1.0 if self.skip_playback else min(1.0, (time.perf_counter() - started) * 1000 / duration)
+            step = progress - done[0]
+            for item_id in item_ids:
+                self.canvas.move(item_id, dx * step, dy * step)
+            done[0] = progress
+            if progress < 1.0:
+                self.root.after(FRAME_MS, _step)
             else:
                 on_finish_callback()
-        _step(1)
-    
+        _step()
+
     def reset_stats(self):
         # resets moves and timer
         self.moves, self.time_elapsed = 0, 0
@@ -397,75 +603,23 @@ class PuzzleGUI:
                 if val == EMPTY_TILE: return r, c
         return None
     
-    def _get_neighbors(self, board):
-        # finds all valid moves from a given board state
-        neighbors = []
-        i, j = self.find_blank(board)
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < BOARD_SIZE and 0 <= nj < BOARD_SIZE:
-                new_state = copy.deepcopy(board)
-                new_state[i][j], new_state[ni][nj] = new_state[ni][nj], new_state[i][j]
-                neighbors.append(new_state)
-        return neighbors
-
-    def board_to_tuple(self, board): return tuple(num for row in board for num in row)
-    def manhattan_distance(self, board):
-        # heuristic: sum of distances of each tile from its goal position
-        distance = 0
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                val = board[i][j]
-                if val != EMPTY_TILE:
-                    goal_i, goal_j = divmod(val - 1, BOARD_SIZE)
-                    distance += abs(goal_i - i) + abs(goal_j - j)
-        return distance
-
-    def misplaced_tiles(self, board):
-        # heuristic: counts the number of tiles not in their correct spot
-        misplaced = 0
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if board[i][j] != EMPTY_TILE and board[i][j] != GOAL_STATE[i][j]:
-                    misplaced += 1
-        return misplaced
-    
-    def generate_puzzle(self, difficulty_moves=50):
-        # creates a solvable puzzle by making random moves from the goal state
-        self.board = copy.deepcopy(GOAL_STATE)
-        last_move = None
-        for _ in range(difficulty_moves):
-            blank_i, blank_j = self.find_blank(self.board)
-            possible_moves = []
-            for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-                ni, nj = blank_i + di, blank_j + dj
-                if 0 <= ni < BOARD_SIZE and 0 <= nj < BOARD_SIZE and (ni, nj) != last_move:
-                    possible_moves.append((ni, nj))
-            if not possible_moves: continue
-            move_i, move_j = random.choice(possible_moves)
-            self.board[blank_i][blank_j], self.board[move_i][move_j] = self.board[move_i][move_j], self.board[blank_i][blank_j]
-            last_move = (blank_i, blank_j)
-
-    def _solve_bfs(self):
-        # breadth-first search, now returns path and performance stats
-        nodes_expanded = 0
-        start_node = self.board
-        queue = deque([(start_node, [])])
-        visited = {self.board_to_tuple(start_node)}
-
-        while queue:
-            current_board, path = queue.popleft()
-            nodes_expanded += 1
-            if current_board == GOAL_STATE:
-                return path, {"nodes_expanded": nodes_expanded}
-
-            for neighbor in self._get_neighbors(current_board):
-                if self.board_to_tuple(neighbor) not in visited:
-                    visited.add(self.board_to_tuple(neighbor))
-                    queue.append((neighbor, path + [neighbor]))
-        return None, {"nodes_expanded": nodes_expanded}
+    def generate_puzzle(self, difficulty="Medium"):
+        # picks a new solvable puzzle, at an exact shortest-solution length for the difficulty
+        depths = DIFFICULTY_CHOICES[difficulty]
+        if depths is None:
+            state = generator.random_board(self.layout)
+        else:
+            state = generator.board_at_depth(self.layout, random.randint(*depths))
+        self.board = self.layout.unpack(state)
 
 def main():
+    # `--batch` runs the headless bulk solver instead of opening a window
+    if "--batch" in sys.argv[1:]:
+        import batch
+        batch.main(sys.argv[1:])
+        return
+
+    _load_gui()
     root = tk.Tk()
     game = PuzzleGUI(root)
     # this try/except block handles ctrl+c in the terminal
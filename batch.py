@@ -0,0 +1,166 @@
+# offline bulk solving: streams puzzles from a jsonl file (or stdin), solves them
+# across a pool of worker processes and writes one jsonl result per puzzle as
+# soon as its chunk comes back. input is read lazily and only a bounded number
+# of chunks is ever in flight, so the corpus never has to fit in memory.
+#
+#   python 8-Puzzle.py --batch puzzles.jsonl --algorithm idastar --workers 8 > results.jsonl
+#
+# each input line is either a bare board ([[8, 6, 7], [2, 5, 4], [3, 0, 1]]) or an
+# object with a "board" key and an optional "id". output lines look like
+#   {"id": 0, "path": [1, 4, ...], "length": 31, "nodes_expanded": 7593, "nodes_generated": 12226,
+#    "duplicates": 7574, "peak_open": 30, "peak_closed": 0, "time": 0.04}
+# where path lists the tile slid into the blank at each move. results come back
+# in completion order, use "id" to match them up. --profile also adds heuristic
+# timing and the expansions/sec timeline to every result. with --algorithm
+# weighted-astar or arastar, --weight and --deadline trade optimality for time and
+# each result also says how far from optimal its path can be ("suboptimality").
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from solver import ALGORITHMS, BOARD_SIZE, SearchBudget, check_board, get_layout, is_solvable, moved_tiles, prepare, solve_state
+
+
+def solve_line(line, line_number, algorithm, profile=False, options=None):
+    # one input line -> one result dict, errors are reported rather than raised
+    try:
+        record = json.loads(line)
+        if isinstance(record, dict):
+            board, puzzle_id = record["board"], record.get("id", line_number)
+        else:
+            board, puzzle_id = record, line_number
+        check_board(board)
+        layout = get_layout(len(board))
+    except (ValueError, KeyError, TypeError) as e:
+        return {"id": line_number, "error": f"bad input: {e}"}
+
+    if not is_solvable(board):
+        return {"id": puzzle_id, "error": "unsolvable"}
+    start_time = time.perf_counter()
+    start = layout.pack(board)
+    budget = SearchBudget(time_heuristic=True) if profile else None
+    try:
+        path, stats = solve_state(start, layout, algorithm, budget, **(options or {}))
+    except Exception as e: # e.g. the distance table on a 4x4 board; one bad line mustn't stop the run
+        return {"id": puzzle_id, "error": f"search failed: {e}"}
+    search_time = time.perf_counter() - start_time
+    if path is None:
+        return {"id": puzzle_id, "error": "no solution found", **stats, "time": search_time}
+    return {"id": puzzle_id, "path": moved_tiles(start, path, layout), "length": len(path),
+            **stats, "time": search_time}
+
+
+def solve_chunk(chunk, algorithm, profile=False, options=None):
+    # runs in a worker: solves a list of (line number, line) and returns encoded results
+    return [json.dumps(solve_line(line, line_number, algorithm, profile, options)) for line_number, line in chunk]
+
+
+def read_chunks(lines, chunk_size):
+    # lazily groups non-blank input lines into chunks, keeping their line numbers
+    numbered = ((n, line) for n, line in enumerate(lines) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk: return
+        yield chunk
+
+
+def prepare_chunk(chunk, algorithm, prepared):
+    # builds any missing tables for the chunk's board sizes here, before a worker
+    # needs them, once per size; bad lines are left for solve_line to report
+    if not algorithm.endswith("-pdb"): return
+    for _, line in chunk:
+        try:
+            record = json.loads(line)
+            board = record["board"] if isinstance(record, dict) else record
+            check_board(board)
+        except (ValueError, KeyError, TypeError):
+            continue
+        if len(board) in prepared: continue
+        prepared.add(len(board))
+        try:
+            prepare(algorithm, len(board))
+        except ValueError: # no tables for this size, every line of it reports that
+            pass
+
+
+def run_batch(lines, output, algorithm="astar-manhattan", workers=None, chunk_size=64, profile=False, options=None):
+    # solves every puzzle from `lines`, writing jsonl to `output`; returns the count
+    workers = workers or os.cpu_count() or 1
+    chunks = read_chunks(lines, chunk_size)
+    solved = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            for result in solve_chunk(chunk, algorithm, profile, options):
+                output.write(result + "\n")
+            solved += len(chunk)
+        output.flush()
+        return solved
+
+    # keep a couple of chunks queued per worker so nobody idles, but no more
+    max_in_flight = workers * 2
+    if algorithm == "table": prepare(algorithm, BOARD_SIZE)
+    prepared = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            prepare_chunk(chunk, algorithm, prepared)
+            pending.add(pool.submit(solve_chunk, chunk, algorithm, profile, options))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                solved += _write_results(done, output)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            solved += _write_results(done, output)
+    return solved
+
+
+def _write_results(done, output):
+    count = 0
+    for future in done:
+        results = future.result()
+        output.write("\n".join(results) + "\n")
+        count += len(results)
+    output.flush()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="solve puzzles in bulk from jsonl")
+    parser.add_argument("--batch", metavar="FILE", nargs="?", const="-", required=True,
+                        help="jsonl file of puzzles, or - for stdin")
+    parser.add_argument("--algorithm", default="astar-manhattan", choices=sorted(ALGORITHMS))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="puzzles sent to a worker at a time")
+    parser.add_argument("--output", default="-", help="jsonl file for results, or - for stdout")
+    parser.add_argument("--profile", action="store_true", help="add heuristic timing and the expansions/sec timeline")
+    parser.add_argument("--weight", type=float, help="heuristic weight for weighted-astar (default 1.5)")
+    parser.add_argument("--deadline", type=float, help="seconds arastar may spend improving each answer")
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.weight is not None:
+        if args.algorithm != "weighted-astar": parser.error("--weight only applies to --algorithm weighted-astar")
+        if not 1 <= args.weight < float("inf"): parser.error("--weight must be at least 1")
+        options["weight"] = args.weight
+    if args.deadline is not None:
+        if args.algorithm != "arastar": parser.error("--deadline only applies to --algorithm arastar")
+        options["deadline"] = args.deadline
+
+    source = sys.stdin if args.batch == "-" else open(args.batch)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    start_time = time.time()
+    try:
+        solved = run_batch(source, sink, args.algorithm, args.workers, args.chunk_size, args.profile, options)
+    finally:
+        if source is not sys.stdin: source.close()
+        if sink is not sys.stdout: sink.close()
+    print(f"solved {solved} puzzles in {time.time() - start_time:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# reproducible solver benchmark. a fixed, seeded corpus is bucketed by optimal
+# depth (3x3 boards picked straight from the distance table, 4x4 boards made by
+# seeded random walks and measured with pattern database a*). each algorithm runs each bucket
+# in a fresh process so peak rss belongs to that run alone, and the results are
+# written as json that later runs can be compared against.
+#
+#   python benchmark.py --output results.json
+#   python benchmark.py --algorithms astar-manhattan idastar --compare baseline.json
+#   python benchmark.py --algorithms hdastar-pdb --buckets 4x4-w80 --workers 1 4 8
+#   python benchmark.py --startup    # import time and footprint of each entry point instead
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import deque
+
+from generator import random_walk
+from solver import ALGORITHMS, SearchBudget, get_layout, solve_state
+
+try:
+    import resource
+except ImportError: # not available on windows, peak rss is reported as null there
+    resource = None
+
+CORPUS_SEED = 8_2024
+# bucket name -> (board size, optimal depth for 3x3 or random walk length for 4x4)
+BUCKETS = {
+    "3x3-d10": (3, 10),
+    "3x3-d20": (3, 20),
+    "3x3-d26": (3, 26),
+    "3x3-d31": (3, 31),
+    "4x4-w40": (4, 40),
+    "4x4-w80": (4, 80),
+}
+# entry points the startup benchmark imports, each in a fresh interpreter; the
+# gui file is loaded the way a spawned --batch worker re-imports it, without running main()
+STARTUP_TARGETS = {
+    "solver": "import solver",
+    "batch": "import batch",
+    "server": "import server",
+    "generator": "import generator",
+    "8-Puzzle.py": "import importlib.util; spec = importlib.util.spec_from_file_location('puzzle_gui', '8-Puzzle.py'); "
+                   "spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+}
+# modules none of the entry points above may load until a window is opened
+GUI_MODULES = ("tkinter", "_tkinter", "sound", "playsound", "winsound", "numpy")
+STARTUP_PROBE = """
+import sys, time, json
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"import_seconds": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+"""
+# algorithm that measures the optimal depth of the 4x4 corpus boards
+DEPTH_ALGORITHM = "astar-pdb"
+# how long to wait on a cell's process between checks that it is still alive
+CELL_POLL_SECONDS = 1.0
+DEFAULT_ALGORITHMS = ["table", "astar-manhattan", "astar-misplaced", "idastar", "bfs", "bibfs", "bidirectional-astar"]
+
+
+def _three_by_three_depths(depths):
+    # every 3x3 state at each wanted depth, in a fixed (bfs) order
+    import distance_table
+    layout = get_layout(3)
+    table = distance_table.load()
+    rank = distance_table.make_ranker(layout)
+    found = {d: [] for d in depths}
+    seen = {layout.goal}
+    frontier = deque([layout.goal])
+    while frontier:
+        state = frontier.popleft()
+        d = table[rank(state)]
+        if d in found: found[d].append(state)
+        for child in layout.successors(state):
+            if child not in seen:
+                seen.add(child)
+                frontier.append(child)
+    return found
+
+
+def build_corpus(buckets, per_bucket, seed=CORPUS_SEED):
+    # bucket name -> list of {"state", "size", "depth"}; the same arguments always give the same corpus
+    corpus = {}
+    wanted = {depth for name, (size, depth) in BUCKETS.items() if name in buckets and size == 3}
+    by_depth = _three_by_three_depths(wanted) if wanted else {}
+    for name in buckets:
+        size, depth = BUCKETS[name]
+        rng = random.Random(f"{seed}:{name}")
+        layout = get_layout(size)
+        if size == 3:
+            states = by_depth[depth]
+            picked = rng.sample(states, min(per_bucket, len(states)))
+            corpus[name] = [{"state": state, "size": size, "depth": depth} for state in picked]
+        else:
+            corpus[name] = []
+            for _ in range(per_bucket):
+                state = random_walk(layout, depth, rng)
+                path, _ = solve_state(state, layout, DEPTH_ALGORITHM)
+                corpus[name].append({"state": state, "size": size, "depth": len(path)})
+    return corpus
+
+
+def bucket_digest(puzzles):
+    # short fingerprint of one bucket, so results from different corpora are never compared by mistake
+    return hashlib.sha256(json.dumps([p["state"] for p in puzzles]).encode()).hexdigest()[:16]
+
+
+def peak_rss_mb():
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macos bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_cell(algorithm, puzzles, max_seconds, results, workers=None, max_memory_mb=None):
+    # runs in a fresh process: one algorithm over one bucket, parallel searches with `workers` processes
+    import parallel_astar
+    parallel_astar.WORKERS = workers
+    runs = []
+    for puzzle in puzzles:
+        layout = get_layout(puzzle["size"])
+        budget = SearchBudget(max_seconds=max_seconds, max_memory_mb=max_memory_mb)
+        start_time = time.perf_counter()
+        try:
+            path, stats = solve_state(puzzle["state"], layout, algorithm, budget)
+        except ValueError as e: # e.g. the distance table on a 4x4 board
+            results.put({"skipped": str(e)})
+            return
+        wall = time.perf_counter() - start_time
+        runs.append({"wall": wall, "nodes_expanded": stats["nodes_expanded"],
+                     "length": None if path is None else len(path), "depth": puzzle["depth"],
+                     "aborted": stats.get("aborted")})
+    results.put({"runs": runs, "peak_rss_mb": peak_rss_mb()})
+
+
+def _cell_outcome(results, worker):
+    # the cell's result, or {"failed": ...} if its process died (e.g. killed for memory) before sending one
+    while True:
+        try:
+            return results.get(timeout=CELL_POLL_SECONDS)
+        except queue.Empty:
+            if worker.is_alive(): continue
+        try: # it may have sent its result just before exiting
+            return results.get(timeout=CELL_POLL_SECONDS)
+        except queue.Empty:
+            return {"failed": f"the benchmark process exited with code {worker.exitcode}"}
+
+
+def summarize(runs, peak_rss):
+    solved = [run for run in runs if run["length"] is not None]
+    wall = sum(run["wall"] for run in runs)
+    nodes = sum(run["nodes_expanded"] for run in runs)
+    return {
+        "puzzles": len(runs),
+        "solved": len(solved),
+        "aborted": sum(1 for run in runs if run["aborted"]),
+        "optimal": sum(1 for run in solved if run["length"] == run["depth"]),
+        "wall_time": wall,
+        "mean_wall_time": wall / len(runs) if runs else 0.0,
+        "nodes_expanded": nodes,
+        "expansions_per_sec": nodes / wall if wall else 0.0,
+        "peak_rss_mb": peak_rss,
+    }
+
+
+def _cells(algorithms, buckets, workers):
+    # (row key, algorithm, bucket, worker count); parallel searches get a row per worker count
+    for algorithm in algorithms:
+        counts = workers if algorithm.startswith("hdastar") else [None]
+        for count in counts:
+            label = algorithm if count is None else f"{algorithm}@{count}"
+            for name in buckets:
+                yield f"{label}/{name}", algorithm, name, count
+
+
+def run_benchmark(algorithms, buckets, per_bucket=5, max_seconds=20.0, seed=CORPUS_SEED, log=sys.stderr, workers=(1,),
+                  max_memory_mb=None):
+    corpus = build_corpus(buckets, per_bucket, seed)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for key, algorithm, name, count in _cells(algorithms, buckets, workers):
+        outcomes = context.Queue()
+        worker = context.Process(target=run_cell, args=(algorithm, corpus[name], max_seconds, outcomes, count, max_memory_mb))
+        worker.start()
+        outcome = _cell_outcome(outcomes, worker)
+        worker.join()
+        if "skipped" in outcome:
+            print(f"{key:40s} skipped: {outcome['skipped']}", file=log)
+            continue
+        if "failed" in outcome:
+            print(f"{key:40s} failed: {outcome['failed']}", file=log)
+            continue
+        results[key] = summarize(outcome["runs"], outcome["peak_rss_mb"])
+        row = results[key]
+        rss = "n/a" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.0f}MB"
+        print(f"{key:40s} {row['solved']}/{row['puzzles']} solved, {row['optimal']} optimal, "
+              f"{row['mean_wall_time'] * 1000:9.1f} ms/puzzle, {row['expansions_per_sec']:10.0f} exp/s, rss {rss}",
+              file=log)
+        if count is not None and count != workers[0]:
+            # parallel rows also get their speedup over the first worker count
+            base = results.get(f"{algorithm}@{workers[0]}/{name}")
+            if base and row["wall_time"]:
+                row["speedup"] = base["wall_time"] / row["wall_time"]
+                print(f"{key:40s} x{row['speedup']:.2f} vs {workers[0]} worker(s)", file=log)
+    return {
+        "corpus": {"seed": seed, "per_bucket": per_bucket,
+                   "digests": {name: bucket_digest(puzzles) for name, puzzles in corpus.items()}},
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "max_seconds": max_seconds,
+        "max_memory_mb": max_memory_mb,
+        "results": results,
+    }
+
+
+def startup_report(targets=STARTUP_TARGETS, repeats=7, log=sys.stderr):
+    # median import and whole-process time of each entry point over fresh interpreters,
+    # plus how many modules it pulls in and which gui/audio modules it shouldn't have
+    here = os.path.dirname(os.path.abspath(__file__))
+    report = {}
+    for name, statement in targets.items():
+        imports, processes = [], []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", STARTUP_PROBE.format(statement=statement)], cwd=here,
+                                    capture_output=True, text=True, check=True).stdout
+            processes.append(time.perf_counter() - start_time)
+            probe = json.loads(output.splitlines()[-1])
+            imports.append(probe["import_seconds"])
+        modules = probe["modules"]
+        unwanted = sorted(m for m in modules if m.split(".")[0] in GUI_MODULES)
+        report[name] = {"import_ms": statistics.median(imports) * 1000, "process_ms": statistics.median(processes) * 1000,
+                        "modules": len(modules), "gui_modules": unwanted}
+        row = report[name]
+        print(f"{name:14s} import {row['import_ms']:7.1f} ms, process {row['process_ms']:7.1f} ms, "
+              f"{row['modules']:4d} modules{'  loads ' + ' '.join(unwanted) if unwanted else ''}", file=log)
+    return report
+
+
+def compare(current, baseline, threshold=0.10):
+    # prints per-cell changes against a baseline, returns the list of regressions
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None: continue
+        bucket = key.split("/")[1]
+        if current["corpus"]["digests"][bucket] != baseline["corpus"]["digests"].get(bucket):
+            print(f"{key:40s} skipped: the baseline ran a different corpus for this bucket")
+            continue
+        speed = now["expansions_per_sec"] / before["expansions_per_sec"] if before["expansions_per_sec"] else 1.0
+        wall = now["wall_time"] / before["wall_time"] if before["wall_time"] else 1.0
+        notes = []
+        if wall > 1 + threshold: notes.append("slower")
+        if now["optimal"] < before["optimal"]: notes.append("lost optimality")
+        if now["solved"] < before["solved"]: notes.append("solved fewer")
+        if notes: regressions.append((key, notes))
+        print(f"{key:40s} wall x{wall:5.2f}  exp/s x{speed:5.2f}  {' '.join(notes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the solvers on a fixed corpus")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=sorted(ALGORITHMS))
+    parser.add_argument("--buckets", nargs="+", default=list(BUCKETS), choices=list(BUCKETS))
+    parser.add_argument("--per-bucket", type=int, default=5, help="puzzles per bucket")
+    parser.add_argument("--max-seconds", type=float, default=20.0, help="time budget per puzzle")
+    parser.add_argument("--max-memory-mb", type=float, default=512.0,
+                        help="estimated search memory per puzzle before it is stopped (0 for no limit)")
+    parser.add_argument("--seed", type=int, default=CORPUS_SEED)
+    parser.add_argument("--output", help="write results json here")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against an earlier results json")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="worker counts to run the hdastar searches with")
+    parser.add_argument("--startup", action="store_true", help="measure entry point import time and footprint instead")
+    args = parser.parse_args()
+
+    if args.startup:
+        report = startup_report()
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"machine": {"python": platform.python_version(), "platform": platform.platform()},
+                           "startup": report}, f, indent=2)
+        # a solver entry point that drags in tk or audio is a regression on its own
+        raise SystemExit(1 if any(row["gui_modules"] for row in report.values()) else 0)
+
+    report = run_benchmark(args.algorithms, args.buckets, args.per_bucket, args.max_seconds, args.seed,
+                           workers=args.workers, max_memory_mb=args.max_memory_mb or None)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
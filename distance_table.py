@@ -0,0 +1,252 @@
+# exact distance-to-goal for every solvable 3x3 board, built once by a
+# retrograde bfs from the goal and kept in a small byte file that is mmap'd.
+# a board's slot is its permutation rank: the blank's cell, then the lehmer code
+# of the tiles in reading order with the last digit dropped. for a fixed blank
+# cell exactly one of the two orders of the last two tiles is solvable, so the
+# 181,440 solvable boards fill the file with no gaps.
+#
+#   python distance_table.py --rebuild    # build distances_3x3.bin from scratch
+#   python distance_table.py --verify     # check the file against the puzzle rules
+import argparse
+import mmap
+import os
+import time
+from collections import deque
+from math import factorial
+
+from solver import EMPTY_TILE, get_layout, is_solvable, search_stats
+
+TABLE_SIZE = 3
+UNKNOWN = 0xFF
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"distances_{TABLE_SIZE}x{TABLE_SIZE}.bin")
+
+_table = None
+
+
+def _rank_weights(layout):
+    # weights[i] is the lehmer digit weight of tile slot i once the last digit is dropped
+    m = layout.cells - 1
+    return tuple(factorial(m - 1 - i) // 2 for i in range(m - 2))
+
+
+def make_ranker(layout):
+    # returns rank(state) -> slot in [0, cells * (cells - 1)! / 2)
+    mask = layout.tile_mask
+    shifts = layout.shifts
+    blank_shift = layout.blank_shift
+    weights = _rank_weights(layout)
+    per_blank = factorial(layout.cells - 1) // 2
+
+    def rank(state):
+        index = 0
+        seen = 0
+        i = 0
+        for shift in shifts:
+            tile = (state >> shift) & mask
+            if tile == EMPTY_TILE: continue
+            if i < len(weights):
+                # smaller tiles still to come = smaller tiles in total minus those already seen
+                index += (tile - 1 - (seen & ((1 << tile) - 1)).bit_count()) * weights[i]
+            seen |= 1 << tile
+            i += 1
+        return (state >> blank_shift) * per_blank + index
+    return rank
+
+
+def make_unranker(layout):
+    # the inverse of make_ranker: slot -> packed state
+    weights = _rank_weights(layout)
+    per_blank = factorial(layout.cells - 1) // 2
+    tiles = list(range(1, layout.cells))
+
+    def unrank(slot):
+        blank, index = divmod(slot, per_blank)
+        remaining = tiles[:]
+        order = []
+        for weight in weights:
+            digit, index = divmod(index, weight)
+            order.append(remaining.pop(digit))
+        # the dropped digit: only one order of the last two tiles is solvable
+        for last in (remaining, remaining[::-1]):
+            flat = order + last
+            flat.insert(blank, EMPTY_TILE)
+            state = sum(tile << shift for tile, shift in zip(flat, layout.shifts)) | (blank << layout.blank_shift)
+            if is_solvable(layout.unpack(state)):
+                return state
+    return unrank
+
+
+_rankers = {}
+
+
+def _ranker(layout):
+    # one cached ranker per board size
+    if layout.size not in _rankers:
+        _rankers[layout.size] = make_ranker(layout)
+    return _rankers[layout.size]
+
+
+def table_length(layout): return layout.cells * factorial(layout.cells - 1) // 2
+
+
+def _rank_keys(keys, layout):
+    # make_ranker for a whole numpy array of layer_search keys at once
+    import numpy as np
+    import layer_search
+    board = layer_search.tiles(keys, layout)
+    blank = np.argmax(board == EMPTY_TILE, axis=1)
+    ordered = board[board != EMPTY_TILE].reshape(len(keys), layout.cells - 1).astype(np.int64)
+    index = blank * (factorial(layout.cells - 1) // 2)
+    for i, weight in enumerate(_rank_weights(layout)):
+        index += (ordered[:, i + 1:] < ordered[:, i:i + 1]).sum(axis=1) * weight
+    return index
+
+
+def build(layout=None):
+    # retrograde bfs from the goal, returns a bytearray of distances. with numpy
+    # around, whole layers are expanded and ranked at once
+    layout = layout or get_layout(TABLE_SIZE)
+    import layer_search
+    if layer_search.np is not None:
+        distances = layer_search.np.full(table_length(layout), UNKNOWN, dtype=layer_search.np.uint8)
+        for depth, keys in layer_search.layers(layout):
+            distances[_rank_keys(keys, layout)] = depth
+        return bytearray(distances.tobytes())
+    rank = make_ranker(layout)
+    distances = bytearray([UNKNOWN]) * table_length(layout)
+    distances[rank(layout.goal)] = 0
+    frontier = deque([layout.goal])
+    successors = layout.successors
+    while frontier:
+        state = frontier.popleft()
+        next_distance = distances[rank(state)] + 1
+        for child in successors(state):
+            slot = rank(child)
+            if distances[slot] == UNKNOWN:
+                distances[slot] = next_distance
+                frontier.append(child)
+    return distances
+
+
+def rebuild(path=TABLE_PATH):
+    # builds the table and writes it atomically next to this module
+    global _table
+    distances = build()
+    tmp_path = f"{path}.{os.getpid()}.tmp" # processes building at once never share a half-written file
+    with open(tmp_path, "wb") as f:
+        f.write(distances)
+    os.replace(tmp_path, path)
+    _table = None
+    return distances
+
+
+def load(path=TABLE_PATH, build_if_missing=True):
+    # mmaps the table, building it first if it isn't on disk yet
+    global _table
+    if _table is not None: return _table
+    layout = get_layout(TABLE_SIZE)
+    if not os.path.exists(path) or os.path.getsize(path) != table_length(layout):
+        if not build_if_missing: return None
+        rebuild(path)
+    with open(path, "rb") as f:
+        _table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _table
+
+
+def verify(distances, layout=None):
+    # checks every slot against the puzzle rules, returns a list of problems found
+    layout = layout or get_layout(TABLE_SIZE)
+    rank = make_ranker(layout)
+    problems = []
+    if len(distances) != table_length(layout):
+        return [f"table has {len(distances)} entries, expected {table_length(layout)}"]
+    if distances[rank(layout.goal)] != 0:
+        problems.append("goal state is not at distance 0")
+
+    # walk the whole state space once more, checking the gradient at every state
+    seen = bytearray(len(distances))
+    seen[rank(layout.goal)] = 1
+    frontier = deque([layout.goal])
+    while frontier:
+        state = frontier.popleft()
+        d = distances[rank(state)]
+        child_distances = []
+        for child in layout.successors(state):
+            slot = rank(child)
+            child_distances.append(distances[slot])
+            if not seen[slot]:
+                seen[slot] = 1
+                frontier.append(child)
+        if d == UNKNOWN:
+            problems.append(f"state {layout.unpack(state)} has no distance")
+        elif any(abs(cd - d) > 1 for cd in child_distances):
+            problems.append(f"state {layout.unpack(state)} has a neighbour more than one move away")
+        elif d > 0 and d - 1 not in child_distances:
+            problems.append(f"state {layout.unpack(state)} has no neighbour closer to the goal")
+        if len(problems) > 20: break
+    if not problems and sum(seen) != len(distances):
+        problems.append(f"only {sum(seen)} of {len(distances)} slots are reachable from the goal")
+    return problems
+
+
+def distance(state, layout=None):
+    # exact number of moves from a packed state to the goal, None if it can't reach it.
+    # an unsolvable board ranks into the slot of its solvable twin, so parity is checked first
+    layout = layout or get_layout(TABLE_SIZE)
+    if not is_solvable(layout.unpack(state)): return None
+    return load()[_ranker(layout)(state)]
+
+
+def solve_state(start, layout):
+    # follows the distance gradient down to zero, no search at all
+    if layout.size != TABLE_SIZE:
+        raise ValueError(f"the distance table only covers {TABLE_SIZE}x{TABLE_SIZE} boards")
+    if not is_solvable(layout.unpack(start)): # it would rank into its solvable twin's slot
+        return None, search_stats(0, 0, 0, 0, 0)
+    table = load()
+    rank = _ranker(layout)
+    state = start
+    d = table[rank(state)]
+    if d == UNKNOWN:
+        return None, search_stats(0, 0, 0, 0, 0)
+    path = []
+    lookups = 0
+    while d:
+        for child in layout.successors(state):
+            lookups += 1
+            if table[rank(child)] == d - 1:
+                state = child
+                break
+        path.append(state)
+        d -= 1
+    # every step "expands" one state and looks up its neighbours until one is downhill
+    return path, search_stats(len(path), lookups, lookups - len(path), 1, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build or check the 3x3 distance table")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the table file from scratch")
+    parser.add_argument("--verify", action="store_true", help="check the table file against the puzzle rules")
+    parser.add_argument("--path", default=TABLE_PATH, help="table file location")
+    args = parser.parse_args()
+
+    if args.rebuild or not os.path.exists(args.path):
+        start_time = time.time()
+        distances = rebuild(args.path)
+        print(f"built {len(distances)} entries in {time.time() - start_time:.1f}s -> {args.path}")
+    if args.verify:
+        with open(args.path, "rb") as f:
+            distances = f.read()
+        problems = verify(distances)
+        for problem in problems:
+            print(problem)
+        counts = {}
+        for d in distances:
+            counts[d] = counts.get(d, 0) + 1
+        print("depth histogram:", dict(sorted(counts.items())))
+        print("ok" if not problems else f"{len(problems)} problem(s) found")
+        raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
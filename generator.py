@@ -0,0 +1,152 @@
+# headless puzzle generator. two kinds of boards:
+#  - uniformly random solvable boards: shuffle the tiles, and if the permutation
+#    has the wrong parity swap two tiles, which pairs every unsolvable board with
+#    exactly one solvable one so nothing is favoured
+#  - boards of an exact optimal depth: on 3x3 a uniform pick among every board at
+#    that distance in the distance table; on other sizes a random walk away from
+#    the goal is solved optimally and the board `depth` moves before the goal on
+#    that path is used (walks start at twice the depth and grow until the shortest
+#    path is long enough, which keeps the solves quick)
+# puzzles are streamed as jsonl that --batch reads straight back in.
+#
+#   python generator.py --count 1000000 --depth 20 --output puzzles.jsonl
+#   python generator.py --size 4 --count 100 --depth 40 --seed 7 > hard.jsonl
+import argparse
+import random
+import sys
+import time
+
+import distance_table
+from solver import EMPTY_TILE, get_layout, solve_state
+
+# board size -> algorithm used to measure depths when there is no distance table
+DEPTH_ALGORITHMS = {4: "astar-pdb"}
+# random walks tried (each longer than the last) before a depth is given up on
+WALK_ATTEMPTS = 20
+
+_depth_slots = {}
+
+
+def solvable_parity(flat, size):
+    # same rule as solver.is_solvable, on a flat list in o(n) by counting cycles
+    tiles = [val for val in flat if val != EMPTY_TILE]
+    seen = [False] * len(tiles)
+    swaps = 0
+    for i in range(len(tiles)):
+        j = i
+        while not seen[j]:
+            seen[j] = True
+            j = tiles[j] - 1
+            if j != i: swaps += 1
+    inversions_odd = swaps % 2
+    if size % 2 == 1:
+        return not inversions_odd
+    blank_row_from_bottom = size - flat.index(EMPTY_TILE) // size
+    return (inversions_odd + blank_row_from_bottom) % 2 == 1
+
+
+def random_board(layout, rng=random):
+    # a uniformly random solvable board, packed
+    flat = list(range(layout.cells))
+    rng.shuffle(flat)
+    if not solvable_parity(flat, layout.size):
+        first, second = [i for i, val in enumerate(flat) if val != EMPTY_TILE][:2]
+        flat[first], flat[second] = flat[second], flat[first]
+    blank = flat.index(EMPTY_TILE)
+    return sum(tile << shift for tile, shift in zip(flat, layout.shifts)) | (blank << layout.blank_shift)
+
+
+def random_walk(layout, steps, rng=random):
+    # a walk away from the goal that never slides the same tile straight back
+    state, previous = layout.goal, None
+    for _ in range(steps):
+        children = [child for child in layout.successors(state) if child != previous]
+        previous, state = state, rng.choice(children)
+    return state
+
+
+def _slots_at(depth):
+    # every distance table slot at `depth`, found with one scan of the table
+    if depth not in _depth_slots:
+        table = bytes(distance_table.load())
+        _depth_slots[depth] = [slot for slot, d in enumerate(table) if d == depth]
+        if not _depth_slots[depth]:
+            raise ValueError(f"no {distance_table.TABLE_SIZE}x{distance_table.TABLE_SIZE} board is {depth} moves from the goal")
+    return _depth_slots[depth]
+
+
+def board_at_depth(layout, depth, rng=random, algorithm=None):
+    # a packed board whose shortest solution is exactly `depth` moves
+    if layout.size == distance_table.TABLE_SIZE:
+        return distance_table.make_unranker(layout)(rng.choice(_slots_at(depth)))
+    algorithm = algorithm or DEPTH_ALGORITHMS.get(layout.size, "idastar")
+    steps = 2 * depth
+    for _ in range(WALK_ATTEMPTS):
+        start = random_walk(layout, steps, rng)
+        path, _ = solve_state(start, layout, algorithm)
+        # every board on a shortest path is itself that far from the goal
+        if path is not None and len(path) >= depth:
+            return ([start] + path)[len(path) - depth]
+        steps += depth
+    raise ValueError(f"no {layout.size}x{layout.size} board {depth} moves from the goal turned up in {WALK_ATTEMPTS} random walks")
+
+
+def generate(layout, count, depth=None, seed=None, algorithm=None):
+    # yields `count` packed boards, all at `depth` if given, else uniformly random
+    rng = random.Random(seed)
+    if depth is not None and layout.size == distance_table.TABLE_SIZE:
+        # at most 24,047 boards share a depth, so unrank them all once up front
+        unrank = distance_table.make_unranker(layout)
+        boards = [unrank(slot) for slot in _slots_at(depth)]
+        for _ in range(count):
+            yield rng.choice(boards)
+        return
+    for _ in range(count):
+        yield random_board(layout, rng) if depth is None else board_at_depth(layout, depth, rng, algorithm)
+
+
+def write_jsonl(boards, layout, output, depth=None, lines_per_write=4096):
+    # writes {"id", "board"[, "depth"]} lines, buffered so millions of boards stay quick
+    # a nested list of ints prints as valid json already, no need for json.dumps per line
+    tail = "}" if depth is None else f', "depth": {depth}}}'
+    pending = []
+    count = 0
+    for state in boards:
+        pending.append(f'{{"id": {count}, "board": {layout.unpack(state)}{tail}')
+        count += 1
+        if len(pending) >= lines_per_write:
+            output.write("\n".join(pending) + "\n")
+            pending = []
+    if pending: output.write("\n".join(pending) + "\n")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="generate solvable puzzles as jsonl")
+    parser.add_argument("--size", type=int, default=3, help="board width")
+    parser.add_argument("--count", type=int, default=1000, help="number of puzzles")
+    parser.add_argument("--depth", type=int, help="exact optimal solution length (default: uniformly random boards)")
+    parser.add_argument("--seed", type=int, help="random seed, for a repeatable corpus")
+    parser.add_argument("--algorithm", help="solver used to measure depths on boards without a distance table")
+    parser.add_argument("--output", default="-", help="jsonl file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    layout = get_layout(args.size)
+    if args.depth is not None and layout.size == distance_table.TABLE_SIZE:
+        try:
+            _slots_at(args.depth)
+        except ValueError as e:
+            parser.error(str(e))
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    start_time = time.time()
+    try:
+        count = write_jsonl(generate(layout, args.count, args.depth, args.seed, args.algorithm), layout, sink, args.depth)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if sink is not sys.stdout: sink.close()
+    print(f"wrote {count} puzzles in {time.time() - start_time:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
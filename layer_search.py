@@ -0,0 +1,220 @@
+# batched searches that work on a whole layer of states at once with numpy.
+# a layer is a sorted uint64 array of tile-only keys (the packed state without
+# the cached blank index, which would not fit next to the 64 tile bits of a 4x4
+# board). successors of every state in a layer are made with one masked shift
+# per slide direction, duplicates are removed with sorted-array lookups and
+# manhattan distance is scored for the whole batch from the same table
+# solver.manhattan uses. numpy is optional: without it these searches raise
+# ValueError and the rest of the solver is unaffected.
+#
+#   python layer_search.py --size 3    # enumerate every 3x3 board, layer by layer
+import argparse
+import time
+
+from solver import get_layout, manhattan, search_stats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_tables = {}
+
+
+def _require_numpy():
+    if np is None:
+        raise ValueError("layer searches need numpy (pip install numpy)")
+
+
+def check_layout(layout):
+    # raises ValueError unless numpy is there and a board's tiles fit in one uint64 key
+    _require_numpy()
+    if layout.blank_shift > 64:
+        raise ValueError(f"layer searches only handle boards up to 4x4, not {layout.size}x{layout.size}")
+
+
+def _layout_tables(layout):
+    # per board size: cell shifts, neighbour cells per (blank, direction) with -1
+    # where there is none, and the manhattan table as arrays
+    if layout.size not in _tables:
+        neighbors = np.full((layout.cells, 4), -1, dtype=np.int64)
+        for cell, entries in enumerate(layout.swaps):
+            for i, entry in enumerate(entries):
+                neighbors[cell, i] = entry[0]
+        _tables[layout.size] = (np.array(layout.shifts, dtype=np.uint64), neighbors,
+                                np.array(manhattan(layout).table, dtype=np.int32))
+    return _tables[layout.size]
+
+
+def to_key(state, layout): return state & ((1 << layout.blank_shift) - 1)
+
+
+def _contains(sorted_keys, keys):
+    # boolean mask of which `keys` appear in the sorted array `sorted_keys`
+    if not len(sorted_keys): return np.zeros(len(keys), dtype=bool)
+    index = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[index] == keys
+
+
+def tiles(keys, layout):
+    # (n, cells) array of the tile on every cell
+    shifts = _layout_tables(layout)[0]
+    return ((keys[:, None] >> shifts) & np.uint64(layout.tile_mask)).astype(np.uint8)
+
+
+def expand(keys, layout):
+    # every child of every key, plus the index of the parent each one came from
+    shifts, neighbors, _ = _layout_tables(layout)
+    board = tiles(keys, layout)
+    blank = np.argmax(board == 0, axis=1)
+    children, parents = [], []
+    for direction in range(4):
+        other = neighbors[blank, direction]
+        rows = np.nonzero(other >= 0)[0]
+        other, blank_cell = other[rows], blank[rows]
+        tile = board[rows, other].astype(np.uint64)
+        children.append(keys[rows] - (tile << shifts[other]) + (tile << shifts[blank_cell]))
+        parents.append(rows)
+    return np.concatenate(children), np.concatenate(parents)
+
+
+def manhattan_scores(keys, layout):
+    # manhattan distance of every key at once
+    table = _layout_tables(layout)[2]
+    return table[np.arange(layout.cells), tiles(keys, layout)].sum(axis=1)
+
+
+def _next_layer(previous, current, layout):
+    # every slide flips the blank's square colour, so a child can only be in the
+    # layer before or after its parent's: checking the previous layer is enough to
+    # drop revisits. returns (next layer, children generated)
+    children = expand(current, layout)[0]
+    fresh = np.unique(children)
+    return fresh[~_contains(previous, fresh)], len(children)
+
+
+def layers(layout, start=None):
+    # yields (depth, sorted keys) for every bfs layer out from `start` (the goal by
+    # default) until the reachable state space is exhausted
+    check_layout(layout)
+    start = layout.goal if start is None else start
+    previous = np.zeros(0, dtype=np.uint64)
+    current = np.array([to_key(start, layout)], dtype=np.uint64)
+    depth = 0
+    while len(current):
+        yield depth, current
+        previous, current = current, _next_layer(previous, current, layout)[0]
+        depth += 1
+
+
+def _trace(layout, depth, closer):
+    # walks back from the goal, `closer(state, d)` says whether a state is d moves
+    # from the start; returns the packed path after the start
+    state = layout.goal
+    path = [state]
+    for d in range(depth - 1, 0, -1):
+        state = next(child for child in layout.successors(state) if closer(child, d))
+        path.append(state)
+    return path[::-1]
+
+
+def bfs(start, layout, budget=None):
+    # breadth-first search a whole layer at a time; the budget is checked once per layer
+    check_layout(layout)
+    goal_key = np.array([to_key(layout.goal, layout)], dtype=np.uint64)
+    nodes_expanded = nodes_generated = duplicates = 0
+    previous = np.zeros(0, dtype=np.uint64)
+    current = np.array([to_key(start, layout)], dtype=np.uint64)
+    found = [current]
+    stored = peak_open = 1
+
+    while len(current):
+        if _contains(current, goal_key)[0]:
+            def closer(state, d): return _contains(found[d], np.array([to_key(state, layout)], dtype=np.uint64))[0]
+            path = _trace(layout, len(found) - 1, closer) if len(found) > 1 else []
+            return path, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, stored)
+        following, generated = _next_layer(previous, current, layout)
+        nodes_expanded += len(current)
+        nodes_generated += generated
+        duplicates += generated - len(following)
+        previous, current = current, following
+        found.append(current)
+        stored += len(current)
+        peak_open = max(peak_open, len(current))
+        if budget is not None:
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, stored),
+                         len(current), stored)
+    return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, stored)
+
+
+def astar(start, layout, budget=None):
+    # a* with manhattan distance, expanding every open state on the lowest f at
+    # once. manhattan is consistent, so no child of that batch can have a lower f
+    # and every state in it already has its optimal g; the batch is repeated until
+    # the f level is empty. the budget is checked once per batch
+    check_layout(layout)
+    goal_key = np.array([to_key(layout.goal, layout)], dtype=np.uint64)
+    nodes_expanded = nodes_generated = duplicates = 0
+    open_keys = np.array([to_key(start, layout)], dtype=np.uint64)
+    open_g = np.zeros(1, dtype=np.int32)
+    open_f = manhattan_scores(open_keys, layout)
+    closed_keys = np.zeros(0, dtype=np.uint64) # sorted, with closed_g alongside
+    closed_g = np.zeros(0, dtype=np.int32)
+    peak_open = 1
+
+    while len(open_keys):
+        lowest = open_f == open_f.min()
+        batch, batch_g = open_keys[lowest], open_g[lowest]
+        open_keys, open_g, open_f = open_keys[~lowest], open_g[~lowest], open_f[~lowest]
+        # one copy of each state (they all share g on the same f), and none already expanded
+        batch, first = np.unique(batch, return_index=True)
+        batch_g = batch_g[first]
+        fresh = ~_contains(closed_keys, batch)
+        duplicates += int(lowest.sum()) - int(fresh.sum())
+        batch, batch_g = batch[fresh], batch_g[fresh]
+        if not len(batch): continue
+
+        nodes_expanded += len(batch)
+        keys = np.concatenate((closed_keys, batch))
+        order = np.argsort(keys, kind="stable")
+        closed_keys, closed_g = keys[order], np.concatenate((closed_g, batch_g))[order]
+        hit = batch == goal_key[0]
+        if hit.any():
+            def closer(state, d):
+                i = np.searchsorted(closed_keys, np.uint64(to_key(state, layout)))
+                return i < len(closed_keys) and closed_keys[i] == to_key(state, layout) and closed_g[i] == d
+            depth = int(batch_g[hit][0])
+            path = _trace(layout, depth, closer) if depth else []
+            return path, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(closed_keys))
+
+        children, parents = expand(batch, layout)
+        nodes_generated += len(children)
+        fresh = ~_contains(closed_keys, children)
+        duplicates += len(children) - int(fresh.sum())
+        children, child_g = children[fresh], batch_g[parents[fresh]] + 1
+        open_keys = np.concatenate((open_keys, children))
+        open_g = np.concatenate((open_g, child_g))
+        open_f = np.concatenate((open_f, child_g + manhattan_scores(children, layout)))
+        peak_open = max(peak_open, len(open_keys))
+        if budget is not None:
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(closed_keys)),
+                         len(open_keys), len(open_keys) + len(closed_keys))
+    return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(closed_keys))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="enumerate every board reachable from the goal, layer by layer")
+    parser.add_argument("--size", type=int, default=3, help="board width")
+    args = parser.parse_args()
+
+    _require_numpy()
+    layout = get_layout(args.size)
+    start_time = time.time()
+    total = 0
+    for depth, keys in layers(layout):
+        total += len(keys)
+        print(f"depth {depth:3d}: {len(keys):12,d} boards ({total:,} so far, {time.time() - start_time:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# hash-distributed a* (hda*) over worker processes. every packed state has one
+# owning worker, picked by a hash of the state; a worker expands only its own
+# states and sends each child to its owner, in batches, over that worker's inbox
+# queue. a worker that reaches the goal reports the cost, which becomes the bound
+# every worker prunes against. the search is over once every worker has nothing
+# left below the bound and no batch is still in flight, which the coordinator
+# (the calling process) checks with two rounds of probes (mattern's four
+# counters). the path is then walked back one parent at a time from the workers
+# that own it.
+#
+#   python parallel_astar.py --size 4 --workers 4 --walk 80
+import argparse
+import heapq
+import multiprocessing
+import os
+import queue
+import random
+import time
+
+from solver import HEURISTICS, get_layout, search_stats
+
+# worker processes a search uses, None means one per core
+WORKERS = None
+# states a worker expands between looking at its inbox and sending batches out
+EXPAND_BATCH = 256
+# pause between probe rounds while some worker is still busy
+PROBE_INTERVAL = 0.005
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+INFINITY = float("inf")
+
+
+def owner(state, workers):
+    # fibonacci hash of the state's low 64 bits (the blank index above them follows from the tiles)
+    return (((state * HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+
+def worker(index, workers, start, size, heuristic_name, inboxes, results):
+    # one worker process: owns the states that hash to `index`
+    layout = get_layout(size)
+    heuristic = HEURISTICS[heuristic_name](layout)
+    goal = layout.goal
+    mask, blank_shift, swaps = layout.tile_mask, layout.blank_shift, layout.swaps
+    inbox = inboxes[index]
+    nodes_expanded = nodes_generated = duplicates = 0
+    sent = received = 0
+    best_g, parents = {}, {}
+    open_list = []
+    peak_open = 0
+    bound = INFINITY
+
+    def push(state, g, parent):
+        # a state can be reopened when a cheaper path to it turns up later
+        nonlocal duplicates
+        if g >= best_g.get(state, INFINITY):
+            duplicates += 1
+            return
+        f = g + heuristic(state)
+        if f >= bound: return
+        best_g[state] = g
+        parents[state] = parent
+        heapq.heappush(open_list, (f, -g, state))
+
+    if owner(start, workers) == index: push(start, 0, None)
+
+    while True:
+        idle = not open_list or open_list[0][0] >= bound
+        # block for mail only when there is nothing to expand
+        while True:
+            try:
+                message = inbox.get(block=idle)
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "states":
+                received += 1
+                for state, g, parent in message[1]:
+                    push(state, g, parent)
+            elif kind == "bound":
+                bound = min(bound, message[1])
+            elif kind == "probe":
+                results.put(("status", index, message[1], not open_list or open_list[0][0] >= bound, sent, received,
+                             search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(best_g)),
+                             len(open_list)))
+            elif kind == "parent":
+                results.put(("parent", message[1], parents.get(message[1])))
+            elif kind == "stop":
+                return
+            idle = not open_list or open_list[0][0] >= bound
+
+        outgoing = [[] for _ in range(workers)]
+        for _ in range(EXPAND_BATCH):
+            if not open_list or open_list[0][0] >= bound: break
+            f, g, state = heapq.heappop(open_list)
+            g = -g
+            if best_g[state] != g:
+                duplicates += 1
+                continue
+            nodes_expanded += 1
+            if state == goal:
+                bound = g
+                results.put(("solution", g))
+                continue
+            blank = state >> blank_shift
+            for _, other_shift, blank_shift_cell, blank_delta in swaps[blank]:
+                tile = (state >> other_shift) & mask
+                child = state + (tile << blank_shift_cell) - (tile << other_shift) + blank_delta
+                nodes_generated += 1
+                if child == parents[state]: # sliding a tile straight back is never cheaper
+                    duplicates += 1
+                    continue
+                dest = owner(child, workers)
+                if dest == index:
+                    push(child, g + 1, state)
+                else:
+                    outgoing[dest].append((child, g + 1, state))
+        if len(open_list) > peak_open: peak_open = len(open_list)
+        for dest, batch in enumerate(outgoing):
+            if batch:
+                inboxes[dest].put(("states", batch))
+                sent += 1
+
+
+def _receive(results, processes):
+    # next message for the coordinator, without hanging if a worker has died
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("a search worker stopped unexpectedly")
+
+
+def solve_state(start, layout, heuristic="manhattan", budget=None, workers=None):
+    # same shape as the other searches: (packed path after the start, stats), or
+    # (None, stats) when there is no solution. the budget is checked every probe round
+    workers = workers or WORKERS or os.cpu_count() or 1
+    HEURISTICS[heuristic](layout) # builds any missing tables here, not in every worker at once
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(i, workers, start, layout.size, heuristic, inboxes, results),
+                                 daemon=True)
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+
+    bound = INFINITY
+    previous = None
+    probe = 0
+    try:
+        while True:
+            probe += 1
+            for inbox in inboxes:
+                inbox.put(("probe", probe))
+            replies = {}
+            while len(replies) < workers:
+                message = _receive(results, processes)
+                if message[0] == "solution" and message[1] < bound:
+                    bound = message[1]
+                    for inbox in inboxes:
+                        inbox.put(("bound", bound))
+                elif message[0] == "status" and message[2] == probe:
+                    replies[message[1]] = message[3:]
+            all_idle = all(reply[0] for reply in replies.values())
+            sent = sum(reply[1] for reply in replies.values())
+            received = sum(reply[2] for reply in replies.values())
+            counters = [reply[3] for reply in replies.values()]
+            stats = {key: sum(c[key] for c in counters) for key in counters[0]}
+            if budget is not None:
+                frontier = sum(reply[4] for reply in replies.values())
+                budget.check(stats, frontier, frontier + stats["peak_closed"])
+            # done once two rounds in a row saw every worker idle with nothing in flight
+            if all_idle and sent == received and previous == (sent, received):
+                break
+            previous = (sent, received) if all_idle and sent == received else None
+            if not all_idle: time.sleep(PROBE_INTERVAL)
+
+        if bound == INFINITY:
+            return None, stats
+        path = []
+        state = layout.goal
+        while state != start:
+            path.append(state)
+            inboxes[owner(state, workers)].put(("parent", state))
+            message = _receive(results, processes)
+            while message[0] != "parent":
+                message = _receive(results, processes)
+            state = message[2]
+        return path[::-1], stats
+    finally:
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive(): process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="solve one random-walk board with hash-distributed a*")
+    parser.add_argument("--size", type=int, default=4, help="board width")
+    parser.add_argument("--walk", type=int, default=80, help="random moves away from the goal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker counts to try")
+    parser.add_argument("--heuristic", default="manhattan", choices=sorted(HEURISTICS))
+    args = parser.parse_args()
+
+    layout = get_layout(args.size)
+    rng = random.Random(args.seed)
+    state = layout.goal
+    for _ in range(args.walk):
+        state = rng.choice(layout.successors(state))
+    for workers in args.workers:
+        start_time = time.perf_counter()
+        path, stats = solve_state(state, layout, args.heuristic, workers=workers)
+        print(f"{workers} workers: {len(path)} moves, {stats['nodes_expanded']:,} expanded, "
+              f"{time.perf_counter() - start_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# disjoint additive pattern databases for n x n boards.
+# the tiles are split into groups; each group's table holds the fewest moves of
+# *that group's tiles* needed to bring them home from every placement, found by
+# a 0-1 bfs backwards from the goal (blank slides over other tiles are free).
+# because no move is counted by two groups, the per-group costs can be added
+# and the sum is still an admissible heuristic.
+#
+#   python pattern_db.py --size 4 --partition 6-6-3    # build offline
+#   python pattern_db.py --size 3 --verify             # check against the 3x3 distance table
+import argparse
+import mmap
+import os
+import time
+
+from solver import EMPTY_TILE, get_layout, manhattan
+
+UNKNOWN = 0xFF
+PDB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# named partitions of the tiles per board width, every tile in exactly one group.
+# the builder keeps a byte per (placement, blank cell), so groups past 6 tiles on
+# a 4x4 board (an 8-tile group would need 16!/8! * 16 bytes, about 8 GB) are out of reach
+PARTITIONS = {
+    3: {
+        "4-4": ((1, 2, 3, 4), (5, 6, 7, 8)),
+    },
+    4: {
+        "5-5-5": ((1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)),
+        "6-6-3": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    },
+}
+DEFAULT_PARTITION = {3: "4-4", 4: "5-5-5"}
+
+_loaded = {}
+
+
+def table_length(cells, group_size):
+    # number of ways to place `group_size` distinct tiles on `cells` cells
+    length = 1
+    for i in range(group_size):
+        length *= cells - i
+    return length
+
+
+def rank_cells(cells_of_group, cells):
+    # partial-permutation rank of the cells holding a group's tiles, in group order
+    index = 0
+    used = 0
+    for i, cell in enumerate(cells_of_group):
+        index = index * (cells - i) + cell - (used & ((1 << cell) - 1)).bit_count()
+        used |= 1 << cell
+    return index
+
+
+def table_path(size, tiles):
+    return os.path.join(PDB_DIR, f"pdb_{size}x{size}_{'-'.join(map(str, tiles))}.bin")
+
+
+def build(layout, tiles):
+    # 0-1 bfs over (group tile cells, blank cell), returns a bytearray indexed by rank_cells
+    cells = layout.cells
+    k = len(tiles)
+    bits = max(1, (cells - 1).bit_length())
+    cell_mask = (1 << bits) - 1
+    blank_shift = bits * k
+    neighbors = tuple(tuple(entry[0] for entry in layout.swaps[cell]) for cell in range(cells))
+    group_shifts = tuple(bits * i for i in range(k))
+
+    goal_cells = [0] * (layout.tile_mask + 1)
+    for cell in range(cells):
+        goal_cells[layout.tile_at(layout.goal, cell)] = cell
+    start = sum(goal_cells[tile] << shift for tile, shift in zip(tiles, group_shifts))
+    start |= goal_cells[EMPTY_TILE] << blank_shift
+
+    entries = bytearray([UNKNOWN]) * table_length(cells, k)
+    # one byte per (group placement, blank cell); cells the group occupies are simply never used
+    seen = bytearray(len(entries) * cells)
+
+    def placement(abstract):
+        return [(abstract >> shift) & cell_mask for shift in group_shifts]
+
+    current = [start]
+    seen[rank_cells(placement(start), cells) * cells + goal_cells[EMPTY_TILE]] = 1
+    level = 0
+    while current:
+        following = []
+        while current:
+            abstract = current.pop()
+            group_cells = placement(abstract)
+            index = rank_cells(group_cells, cells)
+            if entries[index] == UNKNOWN: entries[index] = level
+            blank = abstract >> blank_shift
+            for other in neighbors[blank]:
+                if other in group_cells:
+                    # a group tile slides into the blank: costs one move, lands in the next layer
+                    i = group_cells.index(other)
+                    child = abstract + ((blank - other) << group_shifts[i]) + ((other - blank) << blank_shift)
+                    following.append(child)
+                else:
+                    # the blank slides over a tile from another group: free, same layer
+                    slot = index * cells + other
+                    if not seen[slot]:
+                        seen[slot] = 1
+                        current.append(abstract + ((other - blank) << blank_shift))
+        level += 1
+        for abstract in following:
+            slot = rank_cells(placement(abstract), cells) * cells + (abstract >> blank_shift)
+            if not seen[slot]:
+                seen[slot] = 1
+                current.append(abstract)
+    return entries
+
+
+def rebuild(layout, tiles, path=None):
+    # builds one group's table and writes it atomically
+    path = path or table_path(layout.size, tiles)
+    entries = build(layout, tiles)
+    tmp_path = f"{path}.{os.getpid()}.tmp" # processes building at once never share a half-written file
+    with open(tmp_path, "wb") as f:
+        f.write(entries)
+    os.replace(tmp_path, path)
+    _loaded.pop(path, None)
+    return entries
+
+
+def load(layout, tiles, build_if_missing=True):
+    # mmaps one group's table on first use, building it if it isn't on disk yet
+    path = table_path(layout.size, tiles)
+    if path in _loaded: return _loaded[path]
+    if not os.path.exists(path) or os.path.getsize(path) != table_length(layout.cells, len(tiles)):
+        if not build_if_missing:
+            raise FileNotFoundError(f"pattern database {path} has not been built")
+        rebuild(layout, tiles, path)
+    with open(path, "rb") as f:
+        _loaded[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _loaded[path]
+
+
+def get_partition(size, partition=None):
+    partition = partition or DEFAULT_PARTITION.get(size)
+    if size not in DEFAULT_PARTITION:
+        raise ValueError(f"no pattern databases for {size}x{size} boards")
+    if partition not in PARTITIONS[size]:
+        raise ValueError(f"no pattern database partition {partition!r} for {size}x{size} boards")
+    return PARTITIONS[size][partition]
+
+
+def pattern_database(layout, goal=None, partition=None):
+    # heuristic factory in the same shape as solver.manhattan; tables load on the first call
+    if goal is not None and goal != layout.goal:
+        raise ValueError("pattern databases are only built for the standard goal")
+    groups = get_partition(layout.size, partition)
+    cells, mask, shifts = layout.cells, layout.tile_mask, layout.shifts
+    tables = [load(layout, tiles) for tiles in groups]
+    prepared = tuple(zip(groups, tables))
+
+    def h(state):
+        where = [0] * (mask + 1)
+        cell = 0
+        for shift in shifts:
+            where[(state >> shift) & mask] = cell
+            cell += 1
+        total = 0
+        for tiles, entries in prepared:
+            index = 0
+            used = 0
+            i = 0
+            for tile in tiles:
+                cell = where[tile]
+                index = index * (cells - i) + cell - (used & ((1 << cell) - 1)).bit_count()
+                used |= 1 << cell
+                i += 1
+            total += entries[index]
+        return total
+    return h
+
+
+def verify(layout, partition=None):
+    # checks the summed databases are admissible against the exact 3x3 distances,
+    # and never weaker than manhattan distance; returns a list of problems
+    import distance_table
+    from collections import deque
+
+    if layout.size != distance_table.TABLE_SIZE:
+        return [f"exact distances are only available for {distance_table.TABLE_SIZE}x{distance_table.TABLE_SIZE} boards"]
+    h = pattern_database(layout, partition=partition)
+    md = manhattan(layout)
+    exact = distance_table.load()
+    rank = distance_table.make_ranker(layout)
+    problems = []
+    seen = {layout.goal}
+    frontier = deque([layout.goal])
+    while frontier and len(problems) < 20:
+        state = frontier.popleft()
+        estimate, d = h(state), exact[rank(state)]
+        if estimate > d:
+            problems.append(f"{layout.unpack(state)}: estimate {estimate} is above the true distance {d}")
+        elif estimate < md(state):
+            problems.append(f"{layout.unpack(state)}: estimate {estimate} is below manhattan distance")
+        for child in layout.successors(state):
+            if child not in seen:
+                seen.add(child)
+                frontier.append(child)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build or check additive pattern databases")
+    parser.add_argument("--size", type=int, default=4, help="board width")
+    parser.add_argument("--partition", help="named tile partition, e.g. 6-6-3 (defaults per board size)")
+    parser.add_argument("--verify", action="store_true", help="check the 3x3 databases against exact distances")
+    args = parser.parse_args()
+
+    layout = get_layout(args.size)
+    for tiles in get_partition(args.size, args.partition):
+        start_time = time.time()
+        entries = rebuild(layout, tiles)
+        print(f"group {tiles}: {len(entries)} entries, max {max(entries)}, "
+              f"{time.time() - start_time:.1f}s -> {table_path(args.size, tiles)}")
+    if args.verify:
+        problems = verify(layout, args.partition)
+        for problem in problems:
+            print(problem)
+        print("ok" if not problems else f"{len(problems)} problem(s) found")
+        raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
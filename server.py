@@ -0,0 +1,244 @@
+# small local http/json solving service on asyncio, for tools that want answers
+# without the tk app. searches run on a process pool; identical requests that
+# arrive while the same search is still running wait on that one search instead
+# of starting their own, and finished answers are kept in an lru cache every
+# client shares.
+#
+#   python server.py --port 8088 --workers 4
+#   curl -d '{"board": [[8, 6, 7], [2, 5, 4], [3, 0, 1]], "algorithm": "idastar"}' localhost:8088/solve
+#   curl localhost:8088/stats
+#
+# POST /solve takes {"board": ..., "algorithm": ..., "options": {"weight": ...}} and
+# answers like a --batch result line plus "cached" / "coalesced" flags.
+# GET /stats reports searches queued on the pool, latency percentiles and the
+# cache hit rate.
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from solver import SearchBudget, check_algorithm, prepare, check_board, get_layout, is_solvable, moved_tiles, solve_state
+
+# request options that are passed through to the algorithm that takes them, any
+# other key is ignored
+OPTION_ALGORITHMS = {"weight": "weighted-astar", "deadline": "arastar"}
+# most request latencies kept for the /stats percentiles
+LATENCY_WINDOW = 2048
+MAX_BODY_BYTES = 64 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def solve_packed(start, size, algorithm, options, max_seconds):
+    # runs in a pool worker: one search, answered like a --batch result
+    layout = get_layout(size)
+    budget = SearchBudget(max_seconds=max_seconds)
+    start_time = time.perf_counter()
+    path, stats = solve_state(start, layout, algorithm, budget, **options)
+    stats.pop("expansion_rates", None)
+    stats["time"] = time.perf_counter() - start_time
+    if path is None:
+        return dict(stats, error=f"no solution found ({stats['aborted']})" if "aborted" in stats else "no solution found")
+    return dict(stats, path=moved_tiles(start, path, layout), length=len(path))
+
+
+def parse_request(body):
+    # request json -> (cache key, arguments for solve_packed); raises BadRequest
+    try:
+        request = json.loads(body or b"{}")
+        board = request["board"]
+        check_board(board)
+        layout = get_layout(len(board))
+    except (ValueError, KeyError, TypeError) as e:
+        raise BadRequest(f"bad input: {e}")
+    algorithm = request.get("algorithm", "astar-manhattan")
+    try:
+        check_algorithm(algorithm, layout.size)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    if not is_solvable(board):
+        raise BadRequest("unsolvable")
+    try:
+        options = {key: float(value) for key, value in (request.get("options") or {}).items() if key in OPTION_ALGORITHMS}
+    except (ValueError, TypeError, AttributeError) as e:
+        raise BadRequest(f"bad options: {e}")
+    for key in options:
+        if OPTION_ALGORITHMS[key] != algorithm:
+            raise BadRequest(f"bad options: {key} only applies to {OPTION_ALGORITHMS[key]}")
+    if not 1 <= options.get("weight", 1) < float("inf"):
+        raise BadRequest("bad options: weight must be at least 1")
+    start = layout.pack(board)
+    return (layout.size, start, algorithm, tuple(sorted(options.items()))), (start, layout.size, algorithm, options)
+
+
+class SolverService:
+    def __init__(self, workers=None, cache_entries=100_000, max_seconds=30.0):
+        # spawned, not forked: pool workers start lazily while a request is being
+        # answered, and a forked one would inherit (and hold open) that client's socket
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.max_seconds = max_seconds
+        self.cache = OrderedDict() # key -> finished answer, oldest use first
+        self.cache_entries = cache_entries
+        self.in_flight = {} # key -> future of the search every matching request waits on
+        self.tables = {} # (algorithm, size) -> future of loading (or building) its tables in this process
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = self.searches = self.coalesced = 0
+        self.hits = self.misses = 0
+        self.started = time.time()
+
+    async def solve(self, body):
+        # answers one /solve body, from the cache, a running search, or a new search
+        key, arguments = parse_request(body)
+        # only waits the first time an algorithm and size come up (once tables are
+        # loaded this returns without yielding to the loop)
+        await self._tables_ready(arguments[2], arguments[1])
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return dict(self.cache[key], cached=True, coalesced=False)
+        self.misses += 1
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.searches += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.pool, solve_packed, *arguments, self.max_seconds)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        # shielded, so one client hanging up doesn't cancel the search for the others
+        answer = await asyncio.shield(future)
+        return dict(answer, cached=False, coalesced=coalesced)
+
+    async def _tables_ready(self, algorithm, size):
+        # builds missing tables once, on a thread of this process, so the pool
+        # workers find them on disk instead of each building them at once
+        key = (algorithm, size)
+        if key not in self.tables:
+            self.tables[key] = asyncio.get_running_loop().run_in_executor(None, prepare, algorithm, size)
+        try:
+            await asyncio.shield(self.tables[key])
+        except Exception:
+            self.tables.pop(key, None) # tried again by the next request; the search reports the error
+
+    def _finished(self, key, future):
+        del self.in_flight[key]
+        if future.cancelled() or future.exception() is not None: return
+        answer = future.result()
+        # an aborted search may well succeed next time, so only answers are kept
+        if "error" not in answer:
+            self.cache[key] = answer
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies: return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 3)
+        lookups = self.hits + self.misses
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "queue_depth": len(self.in_flight),
+            "searches": self.searches,
+            "coalesced": self.coalesced,
+            "latency_ms": {"p50": percentile(50), "p90": percentile(90), "p99": percentile(99),
+                           "max": percentile(100), "samples": len(latencies)},
+            "cache": {"entries": len(self.cache), "hits": self.hits, "misses": self.misses,
+                      "hit_rate": self.hits / lookups if lookups else 0.0},
+        }
+
+    async def handle(self, method, path, body):
+        # routes one request, returns (status, json-able answer)
+        if path == "/solve":
+            if method != "POST": return 405, {"error": "use POST"}
+            self.requests += 1
+            start_time = time.perf_counter()
+            try:
+                answer = await self.solve(body)
+            except BadRequest as e:
+                return 400, {"error": str(e)}
+            except Exception as e: # the search itself blew up in its worker
+                return 500, {"error": f"search failed: {e}"}
+            self.latencies.append(time.perf_counter() - start_time)
+            return 200, answer
+        if path == "/stats":
+            if method != "GET": return 405, {"error": "use GET"}
+            return 200, self.stats()
+        return 404, {"error": f"no such endpoint {path}"}
+
+    async def serve_connection(self, reader, writer):
+        # minimal http/1.1: one request after another on the connection until it closes
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip(): break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""): break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, answer = 413, {"error": "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, answer = await self.handle(method, path.split("?", 1)[0], body)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                payload = json.dumps(answer).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def serve(host="127.0.0.1", port=8088, workers=None, max_seconds=30.0, ready=None):
+    service = SolverService(workers, max_seconds=max_seconds)
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    if ready: ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="serve the solvers over local http/json")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--workers", type=int, default=None, help="search processes (default: all cores)")
+    parser.add_argument("--max-seconds", type=float, default=30.0, help="time budget per search")
+    args = parser.parse_args()
+
+    def ready(server):
+        print(f"solving on http://{args.host}:{args.port} (POST /solve, GET /stats)")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_seconds, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
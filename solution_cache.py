@@ -0,0 +1,107 @@
+# bounded lru cache of known optimal solutions, keyed by packed board state.
+# each entry maps a state to the next state on its optimal path, so storing one
+# solution gives every state along it an answer, and the solution suffix from
+# any of them is just a walk down the links. the cache can be saved to disk
+# between sessions; when the file would grow past its byte limit the least
+# recently used entries are the ones left out. a saved cache is only read the
+# first time the cache is used, so creating one costs nothing at startup.
+import os
+import struct
+from collections import OrderedDict
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solution_cache.bin")
+MAGIC = b"SPC1"
+
+
+class SolutionCache:
+    def __init__(self, layout, max_entries=200_000, path=None, max_bytes=8 * 2**20):
+        self.layout = layout
+        self.max_entries = max_entries
+        self.path = path
+        self.max_bytes = max_bytes
+        self.links = OrderedDict() # state -> next state, oldest use first
+        self.hits = self.misses = 0
+        # packed states include the blank index on top of the tiles
+        self.state_bytes = (layout.blank_shift + (layout.cells - 1).bit_length() + 7) // 8
+        self.loaded = False
+
+    def _load_saved(self):
+        if self.loaded: return
+        self.loaded = True
+        if self.path and os.path.exists(self.path):
+            self.load(self.path)
+
+    def __len__(self):
+        self._load_saved()
+        return len(self.links)
+
+    def store(self, start, path):
+        # records every state on an optimal packed path (the states after `start`)
+        self._load_saved()
+        links = self.links
+        state = start
+        for next_state in path:
+            links[state] = next_state
+            links.move_to_end(state)
+            state = next_state
+        while len(links) > self.max_entries:
+            links.popitem(last=False)
+
+    def next_state(self, state):
+        # the next state on a known optimal path, or None; O(1)
+        self._load_saved()
+        next_state = self.links.get(state)
+        if next_state is None:
+            self.misses += 1
+            return None
+        self.links.move_to_end(state)
+        self.hits += 1
+        return next_state
+
+    def solution(self, state):
+        # the full cached suffix from `state` to the goal, or None if any link is missing
+        self._load_saved()
+        goal = self.layout.goal
+        if state == goal: return []
+        path = []
+        while state != goal:
+            state = self.links.get(state)
+            if state is None or len(path) > len(self.links):
+                self.misses += 1
+                return None
+            path.append(state)
+        self.hits += 1
+        for known in path[:-1]:
+            self.links.move_to_end(known)
+        return path
+
+    def save(self, path=None):
+        # writes the most recently used entries that fit in max_bytes
+        path = path or self.path
+        if not path: return
+        self._load_saved() # never overwrite a saved cache with only this session's entries
+        width = self.state_bytes
+        entry_bytes = 2 * width
+        room = max(0, (self.max_bytes - len(MAGIC) - 1) // entry_bytes)
+        entries = list(self.links.items())[-room:] if room else []
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + struct.pack("B", self.layout.size))
+            for state, next_state in entries:
+                f.write(state.to_bytes(width, "little") + next_state.to_bytes(width, "little"))
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        # reads a saved cache, oldest entries first so the lru order survives
+        with open(path, "rb") as f:
+            header = f.read(len(MAGIC) + 1)
+            # a truncated, foreign or other-size file is treated as an empty cache
+            if len(header) != len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC or header[len(MAGIC)] != self.layout.size:
+                return
+            width = self.state_bytes
+            data = f.read()
+        for offset in range(0, len(data) - 2 * width + 1, 2 * width):
+            state = int.from_bytes(data[offset:offset + width], "little")
+            self.links[state] = int.from_bytes(data[offset + width:offset + 2 * width], "little")
+        while len(self.links) > self.max_entries:
+            self.links.popitem(last=False)
@@ -0,0 +1,896 @@
+# headless search engine for the sliding puzzle, no tkinter needed in here.
+# a board is packed into a single integer: 4 bits per tile with cell 0 in the
+# lowest bits, and the blank's cell index cached in the bits above the tiles.
+# searches only ever touch these integers and keep a parent map, the path is
+# rebuilt once at the very end.
+import heapq
+import time
+from collections import deque
+from functools import lru_cache, wraps
+
+# game constants
+GOAL_STATE = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+BOARD_SIZE = 3
+# widest board accepted from outside (files, requests); every size asked for gets a cached layout
+MAX_BOARD_SIZE = 8
+EMPTY_TILE = 0
+
+# searches look at their budget once every CHECK_INTERVAL expansions (a power of two)
+CHECK_INTERVAL = 1024
+# rough size of one stored state (dict slot, int and open-list entry) for memory budgets
+BYTES_PER_STATE = 128
+# most points kept on a search's expansions/sec timeline
+MAX_SAMPLES = 512
+# best-g entry of a state a search has already expanded
+CLOSED = -1
+# weighted a* inflates the heuristic by this much unless told otherwise
+DEFAULT_WEIGHT = 1.5
+# ara* starts with the first weight and works down to optimal (1)
+ARA_WEIGHTS = (3.0, 2.0, 1.5, 1.25, 1.1, 1.0)
+
+
+class Layout:
+    # precomputed tables for one board size, shared by every search on that size
+    def __init__(self, size):
+        self.size = size
+        self.cells = size * size
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.tile_mask = (1 << self.bits) - 1
+        self.blank_shift = self.bits * self.cells
+        self.shifts = tuple(self.bits * cell for cell in range(self.cells))
+
+        # swaps[b] holds one entry per cell the blank at b can trade places with:
+        # (neighbor cell, neighbor shift, blank shift, change to the cached blank index)
+        self.swaps = []
+        for cell in range(self.cells):
+            r, c = divmod(cell, size)
+            entries = []
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    other = nr * size + nc
+                    entries.append((other, self.shifts[other], self.shifts[cell],
+                                    (other - cell) << self.blank_shift))
+            self.swaps.append(tuple(entries))
+        self.swaps = tuple(self.swaps)
+
+        self.goal_board = goal_board(size)
+        self.goal = self.pack(self.goal_board)
+
+    def pack(self, board):
+        # nested list board -> packed integer with the blank index on top
+        state = 0
+        blank = None
+        for cell, val in enumerate(num for row in board for num in row):
+            state |= val << self.shifts[cell]
+            if val == EMPTY_TILE: blank = cell
+        return state | (blank << self.blank_shift)
+
+    def unpack(self, state):
+        # packed integer -> nested list board
+        mask, size = self.tile_mask, self.size
+        flat = [(state >> shift) & mask for shift in self.shifts]
+        return [flat[r * size:(r + 1) * size] for r in range(size)]
+
+    def blank(self, state): return state >> self.blank_shift
+
+    def tile_at(self, state, cell): return (state >> self.shifts[cell]) & self.tile_mask
+
+    def successors(self, state):
+        # every state one slide away, built with the precomputed swap table
+        mask = self.tile_mask
+        children = []
+        for _, other_shift, blank_shift, blank_delta in self.swaps[state >> self.blank_shift]:
+            tile = (state >> other_shift) & mask
+            children.append(state + (tile << blank_shift) - (tile << other_shift) + blank_delta)
+        return children
+
+
+@lru_cache(maxsize=None)
+def get_layout(size=BOARD_SIZE): return Layout(size)
+
+
+class SearchAborted(Exception):
+    # raised inside a search when its budget runs out or it gets cancelled,
+    # carries the stats gathered so far
+    def __init__(self, reason, stats):
+        super().__init__(reason)
+        self.reason = reason
+        self.stats = stats
+
+
+class SearchBudget:
+    # node, time and memory limits for one search, plus a cancel flag that is safe
+    # to set from another thread. it is also the search's instrumentation hook: the
+    # search calls check() every CHECK_INTERVAL expansions, which refreshes
+    # `snapshot`, records a point on the expansions timeline and feeds the progress
+    # callback. searches run without a budget skip all of this, so an unobserved
+    # search pays nothing for it.
+    def __init__(self, max_nodes=None, max_seconds=None, max_memory_mb=None, progress=None, time_heuristic=False):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.max_memory_mb = max_memory_mb
+        self.progress = progress
+        self.time_heuristic = time_heuristic
+        self.cancelled = False
+        self.started = time.perf_counter()
+        self.snapshot = {"nodes_expanded": 0, "frontier": 0, "elapsed": 0.0}
+        self.heuristic_time = 0.0
+        self.heuristic_calls = 0
+        # (elapsed seconds, nodes expanded) every `sample_stride` checks, thinned out
+        # so it never holds more than MAX_SAMPLES points
+        self.samples = []
+        self.sample_stride = 1
+        self.checks = 0
+
+    def cancel(self): self.cancelled = True
+
+    def timed(self, heuristic):
+        # wraps a heuristic so its evaluation time is added up, only if asked for
+        if not self.time_heuristic: return heuristic
+        clock = time.perf_counter
+
+        @wraps(heuristic) # keeps h.table, so incremental updates still apply (astar times those itself)
+        def h(state):
+            started = clock()
+            value = heuristic(state)
+            self.heuristic_time += clock() - started
+            self.heuristic_calls += 1
+            return value
+        return h
+
+    def check(self, counters, frontier, stored):
+        elapsed = time.perf_counter() - self.started
+        self.snapshot = dict(counters, frontier=frontier, elapsed=elapsed)
+        self.checks += 1
+        if self.checks % self.sample_stride == 0:
+            self.samples.append((round(elapsed, 4), counters["nodes_expanded"]))
+            if len(self.samples) >= MAX_SAMPLES:
+                self.samples = self.samples[::2]
+                self.sample_stride *= 2
+        if self.progress: self.progress(self.snapshot)
+
+        reason = None
+        if self.cancelled:
+            reason = "cancelled"
+        elif self.max_nodes and counters["nodes_expanded"] >= self.max_nodes:
+            reason = "node budget"
+        elif self.max_seconds and elapsed >= self.max_seconds:
+            reason = "time budget"
+        elif self.max_memory_mb and stored * BYTES_PER_STATE >= self.max_memory_mb * 2**20:
+            reason = "memory budget"
+        if reason:
+            raise SearchAborted(reason, dict(self.snapshot, aborted=reason))
+
+    def report(self):
+        # the extra stats only an observed search has: the expansions/sec timeline
+        # and, when timed, the heuristic's share of the work
+        rates = []
+        previous_time, previous_nodes = 0.0, 0
+        for elapsed, nodes in self.samples:
+            if elapsed > previous_time:
+                rates.append((elapsed, round((nodes - previous_nodes) / (elapsed - previous_time))))
+            previous_time, previous_nodes = elapsed, nodes
+        report = {"expansion_rates": rates}
+        if self.time_heuristic and self.heuristic_calls:
+            report["heuristic_time"] = self.heuristic_time
+            report["heuristic_calls"] = self.heuristic_calls
+        return report
+
+
+def search_stats(expanded, generated, duplicates, peak_open, peak_closed):
+    # the stats every search reports. expanded counts states actually expanded
+    # (stale open-list entries are not), generated counts every successor built,
+    # duplicates counts successors and pops thrown away as already seen
+    return {"nodes_expanded": expanded, "nodes_generated": generated, "duplicates": duplicates,
+            "peak_open": peak_open, "peak_closed": peak_closed}
+
+
+def goal_board(size):
+    # tiles 1..n*n-1 in reading order with the blank in the bottom right corner
+    flat = list(range(1, size * size)) + [EMPTY_TILE]
+    return [flat[r * size:(r + 1) * size] for r in range(size)]
+
+
+def check_board(board, max_size=MAX_BOARD_SIZE):
+    # raises ValueError unless `board` is a square list of rows, 2x2 up to max_size,
+    # holding 0..n*n-1. run it on untrusted boards before get_layout, which builds
+    # (and keeps) tables for whatever size it is given
+    if not isinstance(board, list) or not 2 <= len(board) <= max_size:
+        raise ValueError(f"board must be a list of 2 to {max_size} rows")
+    if any(not isinstance(row, list) or len(row) != len(board) for row in board):
+        raise ValueError("board must be square")
+    if sorted(num for row in board for num in row) != list(range(len(board) ** 2)):
+        raise ValueError("board is not a permutation of 0..n*n-1")
+
+
+def is_solvable(board):
+    # permutation parity check: inversions among the tiles, plus the blank's row
+    # from the bottom on even widths
+    size = len(board)
+    flat = [num for row in board for num in row]
+    tiles = [val for val in flat if val != EMPTY_TILE]
+    inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    blank_row_from_bottom = size - flat.index(EMPTY_TILE) // size
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+
+def rebuild_path(parents, state):
+    # follows the parent map back to the start, returns the states after the start
+    path = []
+    while parents[state] is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def moved_tiles(start, path, layout):
+    # the tile slid into the blank at each step of a packed path
+    tiles = []
+    for state in path:
+        tiles.append(layout.tile_at(start, layout.blank(state)))
+        start = state
+    return tiles
+
+
+# heuristics: each factory returns a function of a packed state, aimed at `goal`
+# (the layout's goal state when not given). heuristics that are a plain sum over
+# cells also carry h.table[cell][tile], so a search can update them by the one
+# tile that moved instead of re-scoring the whole board
+def manhattan(layout, goal=None):
+    goal = layout.goal if goal is None else goal
+    size, mask = layout.size, layout.tile_mask
+    home = {layout.tile_at(goal, cell): cell for cell in range(layout.cells)}
+    # table[cell][tile] is the distance of `tile` sitting on `cell` from its home cell
+    table = []
+    for cell in range(layout.cells):
+        r, c = divmod(cell, size)
+        row = [0] * (mask + 1)
+        for tile, target in home.items():
+            if tile != EMPTY_TILE:
+                tr, tc = divmod(target, size)
+                row[tile] = abs(tr - r) + abs(tc - c)
+        table.append(row)
+    cells = tuple(zip(layout.shifts, table))
+
+    def h(state):
+        return sum(row[(state >> shift) & mask] for shift, row in cells)
+    h.table = table
+    return h
+
+
+def misplaced(layout, goal=None):
+    goal = layout.goal if goal is None else goal
+    mask = layout.tile_mask
+    wanted = tuple((shift, layout.tile_at(goal, cell)) for cell, shift in enumerate(layout.shifts))
+
+    def h(state):
+        misplaced_count = 0
+        for shift, tile in wanted:
+            val = (state >> shift) & mask
+            if val != EMPTY_TILE and val != tile: misplaced_count += 1
+        return misplaced_count
+    h.table = [[int(val != EMPTY_TILE and val != tile) for val in range(mask + 1)] for _, tile in wanted]
+    return h
+
+
+def _goal_lines(layout, goal):
+    # for every row and column: its cells, and where each tile belongs along it
+    # (only tiles whose home is on that line), keyed by tile
+    size = layout.size
+    home = {layout.tile_at(goal, cell): cell for cell in range(layout.cells)}
+    lines = []
+    for index in range(size):
+        row_cells = tuple(index * size + k for k in range(size))
+        lines.append((row_cells, {tile: cell % size for tile, cell in home.items()
+                                  if tile != EMPTY_TILE and cell // size == index}))
+    for index in range(size):
+        col_cells = tuple(k * size + index for k in range(size))
+        lines.append((col_cells, {tile: cell // size for tile, cell in home.items()
+                                  if tile != EMPTY_TILE and cell % size == index}))
+    return lines
+
+
+def _line_conflict(contents, wanted):
+    # extra moves forced by tiles that are in their home line but in the wrong order:
+    # two per tile that has to step out of the line, i.e. outside the longest
+    # increasing run of home positions
+    targets = [wanted[tile] for tile in contents if tile in wanted]
+    if len(targets) < 2: return 0
+    longest = [1] * len(targets)
+    for i in range(1, len(targets)):
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(targets) - max(longest))
+
+
+def linear_conflict(layout, goal=None):
+    # manhattan distance plus the linear conflicts of every row and column,
+    # each line's value is memoised by its contents
+    goal = layout.goal if goal is None else goal
+    md = manhattan(layout, goal)
+    mask = layout.tile_mask
+    lines = [(tuple(layout.shifts[cell] for cell in cells), wanted, {})
+             for cells, wanted in _goal_lines(layout, goal)]
+
+    def h(state):
+        total = md(state)
+        for shifts, wanted, memo in lines:
+            contents = tuple((state >> shift) & mask for shift in shifts)
+            value = memo.get(contents)
+            if value is None:
+                value = memo[contents] = _line_conflict(contents, wanted)
+            total += value
+        return total
+    return h
+
+
+def pattern_databases(layout, goal=None):
+    # disjoint additive pattern databases, see pattern_db.py (tables load on first use)
+    import pattern_db
+    return pattern_db.pattern_database(layout, goal)
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "misplaced": misplaced,
+    "linear-conflict": linear_conflict,
+    "pdb": pattern_databases,
+}
+
+
+def _move_deltas(layout, table):
+    # deltas[blank][i][tile]: change in a per-cell heuristic when `tile` slides from
+    # the blank's i-th neighbour onto the blank cell, in the same order as layout.swaps
+    return tuple(tuple([table[cell][tile] - table[other][tile] for tile in range(layout.tile_mask + 1)]
+                       for other, _, _, _ in layout.swaps[cell])
+                 for cell in range(layout.cells))
+
+
+def astar(start, layout, heuristic, budget=None, weight=1):
+    # a* over packed states with an integer-keyed bucket open list: buckets[f][g] is
+    # a stack, so the lowest f is popped first, ties go to the highest g and then to
+    # the newest push. a best-g map means a worse copy of a state is never pushed
+    # (expanded states are marked CLOSED in it), parents are recorded on push, and
+    # per-cell heuristics are updated by the single tile that moved.
+    # a weight above 1 makes it weighted a*: f = g + weight * h, kept whole by
+    # scaling both sides by the weight's denominator. expanded states are never
+    # reopened, which still keeps the answer within `weight` times optimal
+    if not 1 <= weight < float("inf"):
+        raise ValueError(f"the heuristic weight must be a number of at least 1, not {weight}")
+    if budget is not None: heuristic = budget.timed(heuristic)
+    table = getattr(heuristic, "table", None)
+    deltas = _move_deltas(layout, table) if table is not None else None
+    # incremental updates bypass the timed wrapper, so when asked they are timed here
+    timing = deltas is not None and budget is not None and budget.time_heuristic
+    clock = time.perf_counter
+    nodes_expanded = nodes_generated = duplicates = 0
+    goal = layout.goal
+    mask, blank_shift, swaps = layout.tile_mask, layout.blank_shift, layout.swaps
+    if weight == 1:
+        g_scale = h_scale = 1
+    else:
+        from fractions import Fraction # slow to import, and plain a* never needs it
+        weight = Fraction(weight).limit_denominator(100)
+        g_scale, h_scale = weight.denominator, weight.numerator
+
+    f = h_scale * heuristic(start)
+    buckets = [[] for _ in range(f)] + [[[start]]]
+    best_g = {start: 0}
+    parents = {start: None}
+    open_size = peak_open = 1
+    closed = 0
+
+    while open_size:
+        level = buckets[f] if f < len(buckets) else None
+        if not level:
+            f += 1
+            if f >= len(buckets): break
+            continue
+        stack = level[-1]
+        if not stack:
+            level.pop()
+            continue
+        g = len(level) - 1
+        state = stack.pop()
+        open_size -= 1
+        if best_g[state] != g:
+            # a cheaper copy was pushed after this one, or it is already expanded
+            duplicates += 1
+            continue
+        best_g[state] = CLOSED
+        closed += 1
+        nodes_expanded += 1
+        if budget is not None and not nodes_expanded & (CHECK_INTERVAL - 1):
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, closed),
+                         open_size, len(best_g) + open_size)
+
+        if state == goal:
+            return rebuild_path(parents, state), search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, closed)
+
+        h = (f - g_scale * g) // h_scale
+        new_cost = g + 1
+        blank = state >> blank_shift
+        move_deltas = deltas[blank] if deltas is not None else None
+        for i, (_, other_shift, blank_shift_cell, blank_delta) in enumerate(swaps[blank]):
+            tile = (state >> other_shift) & mask
+            child = state + (tile << blank_shift_cell) - (tile << other_shift) + blank_delta
+            nodes_generated += 1
+            if best_g.get(child, new_cost + 1) <= new_cost:
+                duplicates += 1
+                continue
+            best_g[child] = new_cost
+            parents[child] = state
+            if move_deltas is None:
+                child_h = heuristic(child)
+            elif timing:
+                started = clock()
+                child_h = h + move_deltas[i][tile]
+                budget.heuristic_time += clock() - started
+                budget.heuristic_calls += 1
+            else:
+                child_h = h + move_deltas[i][tile]
+            child_f = g_scale * new_cost + h_scale * child_h
+            while child_f >= len(buckets): buckets.append([])
+            child_level = buckets[child_f]
+            while new_cost >= len(child_level): child_level.append([])
+            child_level[new_cost].append(child)
+            if child_f < f: f = child_f # only a weighted or inconsistent heuristic can do this
+            open_size += 1
+        if open_size > peak_open: peak_open = open_size
+    return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, closed)
+
+
+def weighted_astar(start, layout, heuristic, budget=None, weight=DEFAULT_WEIGHT):
+    # bounded-suboptimal a*: usually far fewer expansions, at most `weight` times the optimal length
+    path, stats = astar(start, layout, heuristic, budget, weight)
+    stats["suboptimality"] = float(weight)
+    return path, stats
+
+
+def arastar(start, layout, heuristic, budget=None, weights=ARA_WEIGHTS, deadline=None, on_improve=None):
+    # anytime repairing a* (ara*): a quick weighted search first, then repeated with
+    # smaller weights. states whose g improves after they were expanded wait in
+    # `incons` and rejoin the open list for the next weight, so each pass reuses the
+    # previous one's work instead of starting over. every better path is passed to
+    # on_improve(path, length, bound), bound being how far from optimal it can be.
+    # once a path is known, reaching `deadline` seconds ends the search normally and
+    # running out of budget ends it as aborted; either way the best path so far is
+    # returned, with its bound as "suboptimality"
+    if budget is not None: heuristic = budget.timed(heuristic)
+    started = time.perf_counter()
+    nodes_expanded = nodes_generated = duplicates = improvements = 0
+    goal = layout.goal
+    mask, blank_shift, swaps = layout.tile_mask, layout.blank_shift, layout.swaps
+    best_g = {start: 0}
+    parents = {start: None}
+    h_of = {start: heuristic(start)}
+    waiting = {start}
+    best_path, best_length, bound = None, None, float("inf")
+    peak_open = 1
+    out_of_time = False
+
+    def stats():
+        return dict(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(best_g)),
+                    suboptimality=bound, improvements=improvements)
+
+    try:
+        for weight in weights:
+            open_list = [(best_g[s] + weight * h_of[s], -best_g[s], s) for s in waiting]
+            heapq.heapify(open_list)
+            closed, incons = set(), set()
+            while open_list and open_list[0][0] < best_g.get(goal, float("inf")):
+                _, g, state = heapq.heappop(open_list)
+                g = -g
+                if state in closed or best_g[state] != g:
+                    duplicates += 1
+                    continue
+                closed.add(state)
+                nodes_expanded += 1
+                if not nodes_expanded & (CHECK_INTERVAL - 1):
+                    if budget is not None:
+                        budget.check(stats(), len(open_list), len(best_g) + len(open_list))
+                    if best_path is not None and deadline and time.perf_counter() - started >= deadline:
+                        out_of_time = True
+                        break
+                new_cost = g + 1
+                for _, other_shift, blank_shift_cell, blank_delta in swaps[state >> blank_shift]:
+                    tile = (state >> other_shift) & mask
+                    child = state + (tile << blank_shift_cell) - (tile << other_shift) + blank_delta
+                    nodes_generated += 1
+                    if best_g.get(child, new_cost + 1) <= new_cost:
+                        duplicates += 1
+                        continue
+                    best_g[child] = new_cost
+                    parents[child] = state
+                    if child in closed:
+                        incons.add(child)
+                        continue
+                    if child not in h_of: h_of[child] = heuristic(child)
+                    heapq.heappush(open_list, (new_cost + weight * h_of[child], -new_cost, child))
+                if len(open_list) > peak_open: peak_open = len(open_list)
+
+            waiting = {s for _, _, s in open_list if s not in closed} | incons
+            if goal not in best_g: continue
+            # no path can be shorter than the smallest g + h still waiting
+            lower = min((best_g[s] + h_of[s] for s in waiting), default=best_g[goal])
+            # a finished pass also guarantees its weight, a pass cut short by the deadline doesn't
+            bound = min(bound, float("inf") if out_of_time else weight, best_g[goal] / lower if lower else 1.0)
+            if best_path is None or best_g[goal] < best_length:
+                best_path, best_length = rebuild_path(parents, goal), best_g[goal]
+                improvements += 1
+                if on_improve: on_improve(best_path, best_length, bound)
+            if bound <= 1 or out_of_time or (deadline and time.perf_counter() - started >= deadline): break
+    except SearchAborted as e:
+        if best_path is None: raise
+        return best_path, dict(stats(), aborted=e.reason)
+    return best_path, stats()
+
+
+def bfs(start, layout, budget=None):
+    # breadth-first search over packed states, parents doubles as the visited set
+    nodes_expanded = nodes_generated = duplicates = 0
+    goal = layout.goal
+    mask, blank_shift, swaps = layout.tile_mask, layout.blank_shift, layout.swaps
+    parents = {start: None}
+    queue = deque([start])
+    peak_open = 1
+
+    while queue:
+        state = queue.popleft()
+        nodes_expanded += 1
+        if budget is not None and not nodes_expanded & (CHECK_INTERVAL - 1):
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(parents)),
+                         len(queue), len(parents))
+        if state == goal:
+            return rebuild_path(parents, state), search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(parents))
+
+        for _, other_shift, blank_shift_cell, blank_delta in swaps[state >> blank_shift]:
+            tile = (state >> other_shift) & mask
+            child = state + (tile << blank_shift_cell) - (tile << other_shift) + blank_delta
+            nodes_generated += 1
+            if child in parents:
+                duplicates += 1
+            else:
+                parents[child] = state
+                queue.append(child)
+        if len(queue) > peak_open: peak_open = len(queue)
+    return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(parents))
+
+
+def _stitch(forward_parents, backward_parents, meet):
+    # start -> meet from the forward map, then meet -> goal from the backward map
+    path = rebuild_path(forward_parents, meet) if forward_parents[meet] is not None else []
+    state = backward_parents[meet]
+    while state is not None:
+        path.append(state)
+        state = backward_parents[state]
+    return path
+
+
+def _chain_length(parents, state):
+    length = 0
+    while parents[state] is not None:
+        state = parents[state]
+        length += 1
+    return length
+
+
+def bidirectional_bfs(start, layout, budget=None):
+    # grows a bfs from the start and one from the goal, always a whole layer of the
+    # smaller frontier at a time, and stops after the layer where they first touch.
+    # backward parents point one step closer to the goal
+    goal = layout.goal
+    if start == goal: return [], search_stats(0, 0, 0, 1, 0)
+    nodes_expanded = nodes_generated = duplicates = 0
+    forward, backward = {start: None}, {goal: None}
+    forward_layer, backward_layer = [start], [goal]
+    successors = layout.successors
+    peak_open = 2
+
+    while forward_layer and backward_layer:
+        grow_forward = len(forward_layer) <= len(backward_layer)
+        layer, parents, other = (forward_layer, forward, backward) if grow_forward else (backward_layer, backward, forward)
+        next_layer = []
+        meets = []
+        for state in layer:
+            nodes_expanded += 1
+            if budget is not None and not nodes_expanded & (CHECK_INTERVAL - 1):
+                frontier = len(forward_layer) + len(backward_layer) + len(next_layer)
+                budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, max(peak_open, frontier), len(forward) + len(backward)),
+                             frontier, len(forward) + len(backward))
+            for child in successors(state):
+                nodes_generated += 1
+                if child in other:
+                    meets.append((state, child))
+                if child in parents:
+                    duplicates += 1
+                else:
+                    parents[child] = state
+                    next_layer.append(child)
+        peak_open = max(peak_open, len(forward_layer) + len(backward_layer) + len(next_layer))
+
+        if meets:
+            # every meet in this layer has the same depth on this side, pick the
+            # one that is closest to the other side's root
+            state, child = min(meets, key=lambda pair: _chain_length(other, pair[1]))
+            parents[child] = state
+            return _stitch(forward, backward, child), search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(forward) + len(backward))
+
+        if grow_forward: forward_layer = next_layer
+        else: backward_layer = next_layer
+    return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, len(forward) + len(backward))
+
+
+def bidirectional_astar(start, layout, budget=None):
+    # front-to-end bidirectional a*: the forward side aims manhattan at the goal,
+    # the backward side aims it at the start. the side with the smaller top f is
+    # expanded; once the best meeting cost found is no more than the larger of the
+    # two top f values, nothing cheaper can still be out there
+    goal = layout.goal
+    if start == goal: return [], search_stats(0, 0, 0, 1, 0)
+    nodes_expanded = nodes_generated = duplicates = 0
+    peak_open = 2
+    sides = []
+    for root, target in [(start, goal), (goal, start)]:
+        h = manhattan(layout, target)
+        if budget is not None: h = budget.timed(h)
+        sides.append({"h": h, "open": [(h(root), 0, root, None)], "g": {root: 0}, "closed": {}})
+    forward, backward = sides
+    best_cost, meet = None, None
+    successors = layout.successors
+
+    while forward["open"] and backward["open"]:
+        top_forward, top_backward = forward["open"][0][0], backward["open"][0][0]
+        if best_cost is not None and best_cost <= max(top_forward, top_backward):
+            break
+        side, other = (forward, backward) if top_forward <= top_backward else (backward, forward)
+
+        _, g, state, parent = heapq.heappop(side["open"])
+        if state in side["closed"]:
+            duplicates += 1
+            continue
+        side["closed"][state] = parent
+        nodes_expanded += 1
+        if budget is not None and not nodes_expanded & (CHECK_INTERVAL - 1):
+            frontier = len(forward["open"]) + len(backward["open"])
+            closed = len(forward["closed"]) + len(backward["closed"])
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_open, closed),
+                         frontier, frontier + len(forward["g"]) + len(backward["g"]))
+
+        h, g_map, other_g = side["h"], side["g"], other["g"]
+        new_cost = g + 1
+        for child in successors(state):
+            nodes_generated += 1
+            if child in side["closed"] or g_map.get(child, new_cost + 1) <= new_cost:
+                duplicates += 1
+                continue
+            g_map[child] = new_cost
+            heapq.heappush(side["open"], (new_cost + h(child), new_cost, child, state))
+            if child in other_g and (best_cost is None or new_cost + other_g[child] < best_cost):
+                best_cost = new_cost + other_g[child]
+                meet = (side is forward, state, child)
+        peak_open = max(peak_open, len(forward["open"]) + len(backward["open"]))
+
+    stats = search_stats(nodes_expanded, nodes_generated, duplicates, peak_open,
+                      len(forward["closed"]) + len(backward["closed"]))
+    if meet is None:
+        return None, stats
+    # the meeting state may still be open on either side, so rebuild each half
+    # from its closed map plus the single link that reached the meet
+    from_forward, state, child = meet
+    forward_parents, backward_parents = dict(forward["closed"]), dict(backward["closed"])
+    (forward_parents if from_forward else backward_parents)[child] = state
+    for parents, other_side in [(forward_parents, forward), (backward_parents, backward)]:
+        if child not in parents:
+            parents[child] = _open_parent(other_side["open"], child, other_side["g"][child])
+    return _stitch(forward_parents, backward_parents, child), stats
+
+
+def _open_parent(open_set, state, g):
+    # the parent recorded with the best open entry for `state`
+    for _, entry_g, entry_state, parent in open_set:
+        if entry_state == state and entry_g == g: return parent
+    return None
+
+
+def idastar(start, layout, budget=None):
+    # iterative deepening a* with manhattan + linear conflict. works on one flat
+    # board that is changed and restored in place, so memory is just the current
+    # path; the move straight back to the previous blank cell is never tried
+    size, cells = layout.size, layout.cells
+    board = [layout.tile_at(start, cell) for cell in range(cells)]
+    neighbors = tuple(tuple(entry[0] for entry in layout.swaps[cell]) for cell in range(cells))
+
+    home = {layout.tile_at(layout.goal, cell): cell for cell in range(cells)}
+    md = [[0] * (layout.tile_mask + 1) for _ in range(cells)]
+    for cell in range(cells):
+        for tile, target in home.items():
+            if tile != EMPTY_TILE:
+                md[cell][tile] = abs(target // size - cell // size) + abs(target % size - cell % size)
+
+    # lines[0..size) are rows, lines[size..2*size) are columns
+    lines = [(cells_of_line, wanted, {}) for cells_of_line, wanted in _goal_lines(layout, layout.goal)]
+    line_values = [0] * (2 * size)
+
+    def line_value(index):
+        cells_of_line, wanted, memo = lines[index]
+        contents = tuple(board[cell] for cell in cells_of_line)
+        value = memo.get(contents)
+        if value is None:
+            value = memo[contents] = _line_conflict(contents, wanted)
+        return value
+
+    for index in range(2 * size):
+        line_values[index] = line_value(index)
+    start_md = sum(md[cell][board[cell]] for cell in range(cells))
+
+    path = []  # blank cell after each move
+    # ida* keeps no closed set: duplicates counts the undo moves it prunes, and
+    # peak_open is the deepest path it held
+    nodes_expanded = nodes_generated = duplicates = peak_depth = 0
+    found = -1
+
+    def search(blank, g, h_md, h_lc, bound, previous):
+        nonlocal nodes_expanded, nodes_generated, duplicates, peak_depth
+        f = g + h_md + h_lc
+        if f > bound: return f
+        if h_md == 0: return found
+        nodes_expanded += 1
+        if g > peak_depth: peak_depth = g
+        if budget is not None and not nodes_expanded & (CHECK_INTERVAL - 1):
+            budget.check(search_stats(nodes_expanded, nodes_generated, duplicates, peak_depth, 0), len(path), len(path))
+        minimum = None
+        for other in neighbors[blank]:
+            if other == previous:
+                duplicates += 1
+                continue
+            nodes_generated += 1
+            tile = board[other]
+            board[blank], board[other] = tile, EMPTY_TILE
+            child_md = h_md + md[blank][tile] - md[other][tile]
+
+            # only the two lines the tile crosses between can change their conflicts
+            if other // size == blank // size:
+                first, second = size + other % size, size + blank % size
+            else:
+                first, second = other // size, blank // size
+            old_first, old_second = line_values[first], line_values[second]
+            line_values[first], line_values[second] = line_value(first), line_value(second)
+            child_lc = h_lc + line_values[first] + line_values[second] - old_first - old_second
+
+            path.append(other)
+            result = search(other, g + 1, child_md, child_lc, bound, blank)
+            if result == found: return found
+            path.pop()
+
+            line_values[first], line_values[second] = old_first, old_second
+            board[blank], board[other] = EMPTY_TILE, tile
+            if minimum is None or result < minimum: minimum = result
+        return minimum
+
+    bound = start_md + sum(line_values)
+    while True:
+        result = search(layout.blank(start), 0, start_md, sum(line_values), bound, None)
+        if result == found:
+            break
+        if result is None:
+            return None, search_stats(nodes_expanded, nodes_generated, duplicates, peak_depth, 0)
+        bound = result
+
+    # replay the blank moves from the start to get the packed states
+    states = []
+    state = start
+    for other in path:
+        for entry in layout.swaps[state >> layout.blank_shift]:
+            if entry[0] == other:
+                _, other_shift, blank_shift, blank_delta = entry
+                tile = (state >> other_shift) & layout.tile_mask
+                state = state + (tile << blank_shift) - (tile << other_shift) + blank_delta
+                break
+        states.append(state)
+    return states, search_stats(nodes_expanded, nodes_generated, duplicates, peak_depth, 0)
+
+
+def table_lookup(start, layout, budget=None):
+    # exact answer read off the precomputed 3x3 distance table, see distance_table.py
+    import distance_table
+    return distance_table.solve_state(start, layout)
+
+
+def layer_bfs(start, layout, budget=None):
+    # bfs a whole layer at a time with numpy, see layer_search.py
+    import layer_search
+    return layer_search.bfs(start, layout, budget)
+
+
+def layer_astar(start, layout, budget=None):
+    # manhattan a* a whole f level at a time with numpy, see layer_search.py
+    import layer_search
+    return layer_search.astar(start, layout, budget)
+
+
+def hdastar(start, layout, heuristic, budget=None):
+    # a* spread over one worker process per core, see parallel_astar.py
+    import parallel_astar
+    return parallel_astar.solve_state(start, layout, heuristic, budget)
+
+
+# algorithm name -> function(start_state, layout, budget=None) returning (packed path, stats)
+ALGORITHMS = {
+    "astar-manhattan": lambda start, layout, budget=None: astar(start, layout, manhattan(layout), budget),
+    "astar-misplaced": lambda start, layout, budget=None: astar(start, layout, misplaced(layout), budget),
+    "astar-linear-conflict": lambda start, layout, budget=None: astar(start, layout, linear_conflict(layout), budget),
+    "astar-pdb": lambda start, layout, budget=None: astar(start, layout, pattern_databases(layout), budget),
+    "weighted-astar": lambda start, layout, budget=None, **options: weighted_astar(start, layout, manhattan(layout), budget, **options),
+    "arastar": lambda start, layout, budget=None, **options: arastar(start, layout, manhattan(layout), budget, **options),
+    "idastar": idastar,
+    "bfs": bfs,
+    "bibfs": bidirectional_bfs,
+    "bidirectional-astar": bidirectional_astar,
+    "table": table_lookup,
+    "hdastar-manhattan": lambda start, layout, budget=None: hdastar(start, layout, "manhattan", budget),
+    "hdastar-pdb": lambda start, layout, budget=None: hdastar(start, layout, "pdb", budget),
+    "bfs-numpy": layer_bfs,
+    "astar-numpy": layer_astar,
+}
+
+
+def check_algorithm(algorithm, size):
+    # raises ValueError if `algorithm` can't run on size x size boards, before any search starts
+    if not isinstance(algorithm, str) or algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    if algorithm == "table":
+        import distance_table
+        if size != distance_table.TABLE_SIZE:
+            raise ValueError(f"the distance table only covers {distance_table.TABLE_SIZE}x{distance_table.TABLE_SIZE} boards")
+    elif algorithm.endswith("-pdb"):
+        import pattern_db
+        pattern_db.get_partition(size)
+    elif algorithm.endswith("-numpy"):
+        import layer_search
+        layer_search.check_layout(get_layout(size))
+
+
+def prepare(algorithm, size):
+    # loads the on-disk tables `algorithm` reads on size x size boards, building any
+    # that are missing. a parent runs this before handing work to a pool, so the
+    # workers find the tables ready instead of every one of them building its own
+    if algorithm == "table":
+        import distance_table
+        distance_table.load()
+    elif algorithm.endswith("-pdb"):
+        pattern_databases(get_layout(size))
+
+
+def solve_state(start, layout, algorithm="astar-manhattan", budget=None, **options):
+    # packed entry point: returns (list of packed states after the start, stats).
+    # a search stopped by its budget returns (None, partial stats with "aborted").
+    # options go to the algorithm, e.g. weight= for weighted-astar or deadline= and
+    # on_improve= for arastar. unsolvable starts are answered (None, stats) up front:
+    # ida* would otherwise raise its bound forever, and the other searches would
+    # exhaust half the state space first
+    if not is_solvable(layout.unpack(start)):
+        return None, search_stats(0, 0, 0, 0, 0)
+    try:
+        path, stats = ALGORITHMS[algorithm](start, layout, budget, **options)
+    except SearchAborted as e:
+        path, stats = None, e.stats
+    if budget is not None:
+        stats.update(budget.report())
+    return path, stats
+
+
+def solve(board, algorithm="astar-manhattan", budget=None, **options):
+    # board entry point: returns (list of boards after the start, stats) like the gui expects
+    layout = get_layout(len(board))
+    if not is_solvable(board):
+        return None, {"nodes_expanded": 0}
+    path, stats = solve_state(layout.pack(board), layout, algorithm, budget, **options)
+    if path is None:
+        return None, stats
+    return [layout.unpack(state) for state in path], stats
@@ -0,0 +1,99 @@
+# sound effects for the gui, played by one long-lived worker thread. every
+# effect is read into memory once when the player is made; asking for a sound
+# just drops its name on a small bounded queue and returns straight away. a
+# sound that is already waiting isn't queued twice, and when the queue is full
+# the new one is dropped, so a fast ai playback or the timer tick can never
+# back up the ui or pile up threads.
+#
+# on windows the cached wav bytes are played with winsound (SND_MEMORY), which
+# needs no extra library. everywhere else the optional 'playsound' library plays
+# the file, since it can only take a path.
+import os
+import queue
+import sys
+import threading
+
+try:
+    import winsound
+except ImportError: # not on windows
+    winsound = None
+
+# this project uses the 'playsound' library for sound effects outside windows.
+# to install it, run this command in your terminal:
+# pip install playsound==1.2.2
+try:
+    from playsound import playsound
+except ImportError:
+    playsound = None
+
+# effects the gui plays, looked up next to wherever the game is started from
+SOUND_FILES = ("slide.wav", "tick.wav", "solve.wav")
+# sounds that may wait for the worker before new ones are dropped
+QUEUE_SIZE = 4
+
+
+class SoundPlayer:
+    def __init__(self, files=SOUND_FILES, queue_size=QUEUE_SIZE):
+        self.available = winsound is not None or playsound is not None
+        if not self.available:
+            # stderr, so it never ends up mixed into --batch results on stdout
+            print("playsound library not found, so sound effects will be disabled.", file=sys.stderr)
+            print("to enable sound, run: pip install playsound==1.2.2", file=sys.stderr)
+        self.sounds = {} # file name -> wav bytes, for every effect that exists
+        if self.available:
+            for name in files:
+                if os.path.exists(name):
+                    with open(name, "rb") as f:
+                        self.sounds[name] = f.read()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pending = set() # names on the queue right now
+        self.lock = threading.Lock()
+        self.played = self.merged = self.dropped = 0
+        self.thread = None
+
+    def play(self, name):
+        # queues a sound without ever blocking; unknown or missing sounds are ignored
+        if name not in self.sounds: return
+        with self.lock:
+            if name in self.pending:
+                self.merged += 1
+                return
+            try:
+                self.queue.put_nowait(name)
+            except queue.Full:
+                self.dropped += 1
+                return
+            self.pending.add(name)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="sound", daemon=True)
+                self.thread.start()
+
+    def _worker(self):
+        # plays queued sounds one after another until close() sends None
+        while True:
+            name = self.queue.get()
+            if name is None: return
+            with self.lock:
+                self.pending.discard(name)
+            try:
+                if winsound is not None:
+                    winsound.PlaySound(self.sounds[name], winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+                else:
+                    playsound(name)
+                self.played += 1
+            except Exception as e: # a broken file or audio device shouldn't kill the worker
+                print(f"couldn't play {name}: {e}", file=sys.stderr)
+
+    def close(self):
+        # stops the worker once the sound it is playing has finished, anything still queued is skipped
+        if self.thread is None: return
+        with self.lock:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.pending.clear()
+            self.queue.put_nowait(None)
+        self.thread.join(timeout=1)
+        self.thread = None